@@ -2,6 +2,8 @@
 pytest configuration and fixtures for CodeXam tests
 """
 
+import functools
+
 import pytest
 import tempfile
 import os
@@ -13,11 +15,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Try to import app and database modules
 try:
-    from app import app
+    from app import app as flask_app
     APP_AVAILABLE = True
 except ImportError:
     APP_AVAILABLE = False
-    app = None
+    flask_app = None
 
 try:
     from database import create_tables, get_db_connection
@@ -27,6 +29,81 @@ except ImportError:
     create_tables = None
     get_db_connection = None
 
+# SQLite PRAGMAs for test connections. Test databases are throwaway, so
+# durability guarantees only cost time: skipping the per-commit fsync and
+# keeping the journal in memory removes most of the overhead of the many
+# small INSERTs performed by test fixtures.
+_TEST_DB_PRAGMAS = (
+    'PRAGMA journal_mode = MEMORY',
+    'PRAGMA synchronous = OFF',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA locking_mode = EXCLUSIVE',
+)
+
+def apply_test_pragmas(conn):
+    """Apply speed-over-durability PRAGMAs to a test database connection."""
+    for pragma in _TEST_DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+if DATABASE_AVAILABLE and get_db_connection:
+    import sqlite3
+
+    import database as _database
+
+    _original_get_db_connection = _database.get_db_connection
+
+    # One persistent connection per (process, database path). Re-opening a
+    # connection for every fixture helper repeats SQLite's schema parse and
+    # PRAGMA setup; keeping it open leaves the page cache warm.
+    _shared_connection = None
+    _shared_connection_path = None
+
+    def _close_shared_connection():
+        """Close the cached test connection if one is open."""
+        global _shared_connection, _shared_connection_path
+        if _shared_connection is not None:
+            try:
+                _shared_connection.close()
+            except sqlite3.Error:
+                pass
+        _shared_connection = None
+        _shared_connection_path = None
+
+    def _get_test_db_connection(*args, **kwargs):
+        """Return a persistent test connection with test PRAGMAs applied."""
+        global _shared_connection, _shared_connection_path
+        db_path = flask_app.config.get('DATABASE') if flask_app else None
+
+        if _shared_connection is not None and _shared_connection_path == db_path:
+            # Health check mirrors database.DatabaseConnection.get_connection
+            try:
+                _shared_connection.execute("SELECT 1").fetchone()
+                return _shared_connection
+            except sqlite3.Error:
+                pass  # Connection is stale or was closed by a test
+
+        _close_shared_connection()
+        conn = _original_get_db_connection(*args, **kwargs)
+        # Only relax durability for test-configured apps
+        if flask_app is None or flask_app.config.get('TESTING'):
+            apply_test_pragmas(conn)
+        _shared_connection = conn
+        _shared_connection_path = db_path
+        return conn
+
+    # Rebind before test modules import get_db_connection so every test
+    # connection picks up the shared connection without per-test patching
+    _database.get_db_connection = _get_test_db_connection
+    get_db_connection = _get_test_db_connection
+
+@pytest.fixture(scope='session', autouse=True)
+def _shared_db_connection_cleanup():
+    """Close the persistent test database connection at session end."""
+    yield
+    if DATABASE_AVAILABLE and get_db_connection:
+        _close_shared_connection()
+
 @pytest.fixture
 def app_instance():
     """Create and configure a test Flask application."""
@@ -37,20 +114,20 @@ def app_instance():
     db_fd, db_path = tempfile.mkstemp()
     
     # Configure app for testing
-    app.config['DATABASE'] = db_path
-    app.config['TESTING'] = True
-    app.config['WTF_CSRF_ENABLED'] = False
-    app.config['SECRET_KEY'] = 'test-secret-key'
+    flask_app.config['DATABASE'] = db_path
+    flask_app.config['TESTING'] = True
+    flask_app.config['WTF_CSRF_ENABLED'] = False
+    flask_app.config['SECRET_KEY'] = 'test-secret-key'
     
     if DATABASE_AVAILABLE and create_tables:
-        with app.app_context():
+        with flask_app.app_context():
             try:
                 create_tables()
             except Exception:
                 # If database creation fails, still provide app for basic tests
                 pass
     
-    yield app
+    yield flask_app
     
     # Clean up
     os.close(db_fd)
@@ -95,12 +172,12 @@ def test_database():
     
     # Set up database
     original_db = None
-    if APP_AVAILABLE and app:
-        original_db = app.config.get('DATABASE')
-        app.config['DATABASE'] = db_path
+    if APP_AVAILABLE and flask_app:
+        original_db = flask_app.config.get('DATABASE')
+        flask_app.config['DATABASE'] = db_path
         
         if DATABASE_AVAILABLE and create_tables:
-            with app.app_context():
+            with flask_app.app_context():
                 try:
                     create_tables()
                 except Exception:
@@ -116,8 +193,8 @@ def test_database():
         pass
     
     # Restore original database
-    if APP_AVAILABLE and app and original_db:
-        app.config['DATABASE'] = original_db
+    if APP_AVAILABLE and flask_app and original_db:
+        flask_app.config['DATABASE'] = original_db
 
 @pytest.fixture
 def sample_code():
@@ -191,6 +268,19 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "slow: marks tests as slow")
     config.addinivalue_line("markers", "integration: marks integration tests")
     config.addinivalue_line("markers", "unit: marks unit tests")
+    config.addinivalue_line(
+        "markers",
+        "serial: tests sharing mutable global state; kept on one xdist worker")
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): group tests onto one worker (no-op without xdist)")
+    config.addinivalue_line(
+        "markers",
+        "selenium: Browser-driven tests that need Chrome WebDriver")
+    # Browser suites stay out of the default run; opt in with -m selenium
+    # (or any explicit -m expression).
+    if not config.option.markexpr:
+        config.option.markexpr = "not selenium"
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
@@ -202,16 +292,262 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.integration)
         elif "test_integration" in item.nodeid:
             item.add_marker(pytest.mark.integration)
+        elif "test_system_info_modal_js" in item.nodeid:
+            # Browser suites are opt-in: deselected by default via
+            # -m "not selenium" in pytest.ini, run with -m selenium
+            item.add_marker(pytest.mark.selenium)
             
         # Mark slow tests
         if "timeout" in item.name.lower() or "performance" in item.name.lower():
             item.add_marker(pytest.mark.slow)
 
+        # Keep serial tests together under pytest-xdist: with
+        # `-n auto --dist loadgroup` everything in the 'serial' group
+        # lands on one worker while the rest shard freely
+        if "serial" in item.keywords:
+            item.add_marker(pytest.mark.xdist_group("serial"))
+
+# Problems seeded once into the session-scoped app database
+_SEED_PROBLEMS = [
+    ('Two Sum', 'Find two numbers that add up to target', 'Easy',
+     '{"python": "def solution(nums, target):"}',
+     '[{"input": [[2, 7, 11, 15], 9], "output": [0, 1]}]'),
+    ('Reverse String', 'Reverse a string', 'Easy',
+     '{"python": "def solution(s):"}',
+     '[{"input": ["hello"], "output": "olleh"}]'),
+    ('Add Two Numbers', 'Add two integers', 'Easy',
+     '{"python": "def solution(a, b):"}',
+     '[{"input": [1, 2], "output": 3}]'),
+]
+
+@pytest.fixture(scope='session')
+def app():
+    """Session-scoped Flask application configured for testing.
+
+    Building the app, schema and seed data once per session instead of
+    per test removes the dominant fixed cost from request-level tests;
+    tests that mutate data should use the test_db fixture, which rolls
+    their changes back.
+    """
+    if not APP_AVAILABLE:
+        pytest.skip("Flask app not available")
+
+    db_fd, db_path = tempfile.mkstemp()
+
+    flask_app.config.update(
+        DATABASE=db_path,
+        TESTING=True,
+        WTF_CSRF_ENABLED=False,
+        SECRET_KEY='test-secret-key',
+    )
+
+    if DATABASE_AVAILABLE and create_tables:
+        with flask_app.app_context():
+            try:
+                create_tables()
+                conn = get_db_connection()
+                conn.executemany(
+                    'INSERT INTO problems '
+                    '(title, description, difficulty, function_signatures, test_cases) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    _SEED_PROBLEMS
+                )
+                conn.commit()
+            except Exception:
+                # If database creation fails, still provide app for basic tests
+                pass
+
+    yield flask_app
+
+    # Clean up
+    os.close(db_fd)
+    try:
+        os.unlink(db_path)
+    except OSError:
+        pass
+
+@pytest.fixture
+def test_db(app):
+    """Give each test the pristine seeded database.
+
+    Opens a SAVEPOINT around the test and rolls it back on teardown, so
+    tests can mutate data freely without paying for a re-seed.
+    """
+    if not (DATABASE_AVAILABLE and get_db_connection):
+        pytest.skip("database module not available")
+
+    with app.app_context():
+        conn = get_db_connection()
+        conn.execute('SAVEPOINT test_db')
+        yield conn
+        conn.execute('ROLLBACK TO SAVEPOINT test_db')
+        conn.execute('RELEASE SAVEPOINT test_db')
+
 @pytest.fixture
 def client(app):
     """Create a test client for the Flask application."""
     return app.test_client()
 
+@functools.lru_cache(maxsize=1)
+def _build_modal_app():
+    """Construct the factory-path test app exactly once per process.
+
+    Blueprint registration in create_app is the expensive part; caching
+    here keeps it to one invocation even if a fixture is ever re-scoped
+    or another suite asks for the app directly.
+    """
+    from app import create_app
+
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+# Serialized bytes of the freshly initialized modal database.
+# sqlite3.Connection.deserialize restores them with a memcpy, versus
+# re-running the full DDL + seed-insert pass of initialize_database.
+_modal_db_snapshot = None
+
+@pytest.fixture(scope='session')
+def modal_app():
+    """Session-scoped application for the system-info modal suites.
+
+    Those modules drive the factory path (create_app + initialize_database
+    on an in-memory database) rather than the module-level flask_app, so
+    they share this fixture instead of app. The initialized database is
+    snapshotted once; any later setup restores the snapshot instead of
+    re-initializing.
+    """
+    global _modal_db_snapshot
+    from init_db import initialize_database
+    from database import get_db
+
+    app = _build_modal_app()
+
+    with app.app_context():
+        if _modal_db_snapshot is None:
+            initialize_database(":memory:")
+            _modal_db_snapshot = get_db().get_connection().serialize()
+        else:
+            get_db().get_connection().deserialize(_modal_db_snapshot)
+
+    yield app
+
+@pytest.fixture
+def fresh_modal_db(modal_app):
+    """Restore the pristine modal database after a test that writes to it.
+
+    The modal suites are read-only today, so the session snapshot alone
+    covers them; mutating tests should depend on this fixture rather
+    than calling initialize_database again.
+    """
+    from database import get_db
+
+    with modal_app.app_context():
+        conn = get_db().get_connection()
+        yield conn
+        conn.deserialize(_modal_db_snapshot)
+
+@pytest.fixture(scope='session')
+def chrome_service():
+    """Session-scoped chromedriver service for the Selenium suites.
+
+    Passing one Service into every webdriver.Chrome call avoids forking
+    a fresh chromedriver binary per driver construction.
+    """
+    from selenium import webdriver
+
+    # Route chromedriver's own log to /dev/null; nothing reads it and
+    # writing it adds I/O to every command
+    service = webdriver.ChromeService(log_output=os.devnull)
+    yield service
+    try:
+        service.stop()
+    except Exception:
+        pass  # Already stopped by the last driver's quit()
+
+@pytest.fixture(scope='session')
+def app_server(modal_app):
+    """Serve the modal app over HTTP once for the browser-driven suites.
+
+    One in-process werkzeug server is shared by every Selenium test
+    class; startup is a readiness poll on the bound port and teardown
+    shuts the server down cleanly. Under pytest-xdist each worker runs
+    its own copy of this session fixture, and binding port 0 hands every
+    worker a distinct OS-assigned port, so `-n auto` runs the browser
+    tests in parallel without port or driver contention.
+    """
+    import socket
+    import threading
+    import time
+
+    from werkzeug.serving import make_server
+
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+    # Bind and listen once, then hand the live socket to the server:
+    # closing and letting the server rebind would leave a window for
+    # another process to grab the port
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(128)
+    port = sock.getsockname()[1]
+
+    server = make_server('127.0.0.1', port, modal_app, fd=sock.fileno())
+    sock.close()  # make_server duplicated the descriptor
+    server_thread = threading.Thread(
+        target=server.serve_forever, daemon=True,
+        name=f'app-server-{worker}')
+    server_thread.start()
+
+    # The socket is already listening, so connections queue from here on;
+    # a tight connect loop confirms the serving thread is up without a
+    # fixed sleep, and fails the fixture fast if the thread died
+    deadline = time.time() + 5
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise RuntimeError('app_server did not become ready within 5s')
+            time.sleep(0.02)
+
+    yield f"http://127.0.0.1:{port}"
+
+    server.shutdown()
+
+@pytest.fixture(scope='session')
+def prefetched_pages(modal_app):
+    """Fetch the modal suites' small endpoint set once, in parallel.
+
+    Returns {url: response}. The homepage render and the stylesheet are
+    independent, so overlapping the two request cycles hides most of the
+    dispatch latency behind one fetch.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    urls = ('/', '/static/css/system-info-modal.css')
+
+    def fetch(url):
+        with modal_app.test_client() as fetch_client:
+            return url, fetch_client.get(url)
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        return dict(pool.map(fetch, urls))
+
+@pytest.fixture
+def authenticated_client(client):
+    """Test client with a logged-in session.
+
+    Writes the session directly instead of posting /set_name, skipping a
+    full request/redirect cycle per test that needs authentication.
+    """
+    with client.session_transaction() as sess:
+        sess['user_name'] = 'testuser'
+        sess['user_id'] = 1
+    return client
+
 @pytest.fixture
 def runner(app):
     """Create a test runner for the Flask application."""
@@ -20,14 +20,50 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app import app
 from database import create_tables, get_db_connection
+
+# Freeze test configuration once; re-writing app.config in every
+# setup_method triggers Flask's config machinery per test for no benefit
+app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
 from judge import JudgeResult
 from models import Problem, Submission
 
 try:
     import form_validation
-    HAS_FORM_VALIDATION = True
 except ImportError:
-    HAS_FORM_VALIDATION = False
+    form_validation = None
+
+# Fixture SQL shared by the _create_* helpers, defined once so SQLite's
+# statement cache can reuse the prepared statements
+_INSERT_PROBLEM_SQL = (
+    'INSERT INTO problems (title, description, difficulty, function_signatures, test_cases) '
+    'VALUES (?, ?, ?, ?, ?)'
+)
+_INSERT_SUBMISSION_SQL = (
+    'INSERT INTO submissions (user_name, problem_id, language, code, status, execution_time) '
+    'VALUES (?, ?, ?, ?, ?, ?)'
+)
+
+
+def _post_submit(client, payload):
+    """POST a submission payload to /submit as compact JSON."""
+    # Compact separators skip the default encoder's padding and give the
+    # request parser fewer bytes to scan
+    return client.post('/submit',
+                       data=json.dumps(payload, separators=(',', ':')),
+                       content_type='application/json')
+
+
+@pytest.fixture(autouse=True)
+def _app_ctx():
+    """Run every test inside a single application context.
+
+    Pushing a fresh context in each DB helper allocates _AppCtxGlobals and
+    runs teardown callbacks per call; one context per test is enough.
+    (Class-scoped setup still pushes its own context because it runs
+    before function-scoped fixtures.)
+    """
+    with app.app_context():
+        yield
 
 
 class TestApplicationSetup:
@@ -56,11 +92,9 @@ class TestDatabaseOperations:
         self.db_fd, self.db_path = tempfile.mkstemp()
         self.original_db = app.config.get('DATABASE')
         app.config['DATABASE'] = self.db_path
-        app.config['TESTING'] = True
         
         # Initialize test database
-        with app.app_context():
-            create_tables()
+        create_tables()
     
     def teardown_method(self):
         """Clean up test database."""
@@ -71,41 +105,37 @@ class TestDatabaseOperations:
     
     def test_database_connection(self):
         """Test database connection functionality."""
-        with app.app_context():
-            conn = get_db_connection()
-            assert conn is not None
-            
-            # Test basic query
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
-            assert len(tables) > 0
-            conn.close()
+        conn = get_db_connection()
+        assert conn is not None
+        
+        # Test basic query
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        tables = cursor.fetchall()
+        assert len(tables) > 0
     
     def test_database_tables_created(self):
         """Test that required database tables are created."""
-        with app.app_context():
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            
-            # Check problems table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='problems';")
-            assert cursor.fetchone() is not None
-            
-            # Check submissions table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='submissions';")
-            assert cursor.fetchone() is not None
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # Check problems table
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='problems';")
+        assert cursor.fetchone() is not None
+        
+        # Check submissions table
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='submissions';")
+        assert cursor.fetchone() is not None
             
-            conn.close()
 
 
 class TestHomepageRoute:
     """Test the homepage route functionality."""
-    
-    def setup_method(self):
-        """Set up test client."""
-        app.config['TESTING'] = True
-        self.client = app.test_client()
+
+    @classmethod
+    def setup_class(cls):
+        """Set up a shared test client (tests are read-only)."""
+        cls.client = app.test_client()
     
     def test_homepage_get(self):
         """Test GET request to homepage."""
@@ -126,28 +156,20 @@ class TestHomepageRoute:
         # Should contain links to main sections
         assert 'problems' in response_text.lower() or 'href="/problems"' in response_text
     
-    def test_homepage_statistics(self):
-        """Test that homepage displays platform statistics."""
-        response = self.client.get('/')
-        # Should not error even with empty database
-        assert response.status_code == 200
-
 
 class TestProblemsRoutes:
     """Test problems listing and detail routes."""
     
     def setup_method(self):
         """Set up test client and sample data."""
-        app.config['TESTING'] = True
         self.client = app.test_client()
         
         # Set up test database
         self.db_fd, self.db_path = tempfile.mkstemp()
         app.config['DATABASE'] = self.db_path
         
-        with app.app_context():
-            create_tables()
-            self._create_sample_problems()
+        create_tables()
+        self._create_sample_problems()
     
     def teardown_method(self):
         """Clean up test database."""
@@ -185,21 +207,19 @@ class TestProblemsRoutes:
         
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        for problem in sample_problems:
-            cursor.execute('''
-                INSERT INTO problems (title, description, difficulty, function_signatures, test_cases)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
+
+        cursor.executemany(_INSERT_PROBLEM_SQL, [
+            (
                 problem['title'],
-                problem['description'], 
+                problem['description'],
                 problem['difficulty'],
                 problem['function_signatures'],
                 problem['test_cases']
-            ))
-        
+            )
+            for problem in sample_problems
+        ])
+
         conn.commit()
-        conn.close()
     
     def test_problems_list_get(self):
         """Test GET request to problems list."""
@@ -211,12 +231,10 @@ class TestProblemsRoutes:
     def test_problems_list_empty(self):
         """Test problems list with empty database."""
         # Clear all problems
-        with app.app_context():
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM problems')
-            conn.commit()
-            conn.close()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM problems')
+        conn.commit()
         
         response = self.client.get('/problems')
         assert response.status_code == 200
@@ -245,17 +263,14 @@ class TestSubmissionRoutes:
     
     def setup_method(self):
         """Set up test client and sample data."""
-        app.config['TESTING'] = True
-        app.config['WTF_CSRF_ENABLED'] = False
         self.client = app.test_client()
         
         # Set up test database
         self.db_fd, self.db_path = tempfile.mkstemp()
         app.config['DATABASE'] = self.db_path
         
-        with app.app_context():
-            create_tables()
-            self._create_sample_problem()
+        create_tables()
+        self._create_sample_problem()
     
     def teardown_method(self):
         """Clean up test database."""
@@ -279,10 +294,7 @@ class TestSubmissionRoutes:
         
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO problems (title, description, difficulty, function_signatures, test_cases)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
+        cursor.execute(_INSERT_PROBLEM_SQL, (
             problem_data['title'],
             problem_data['description'],
             problem_data['difficulty'],
@@ -290,7 +302,6 @@ class TestSubmissionRoutes:
             problem_data['test_cases']
         ))
         conn.commit()
-        conn.close()
     
     @patch('judge.SimpleJudge.execute_code')
     def test_submit_valid_code(self, mock_execute):
@@ -310,9 +321,7 @@ class TestSubmissionRoutes:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit', 
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         assert response.status_code == 200
         result = json.loads(response.data)
@@ -337,9 +346,7 @@ class TestSubmissionRoutes:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         assert response.status_code == 200
         result = json.loads(response.data)
@@ -362,9 +369,7 @@ class TestSubmissionRoutes:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         assert response.status_code == 200
         result = json.loads(response.data)
@@ -380,9 +385,7 @@ class TestSubmissionRoutes:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         assert response.status_code == 400
     
@@ -394,9 +397,7 @@ class TestSubmissionRoutes:
             # Missing code and user_name
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(incomplete_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, incomplete_data)
         
         assert response.status_code == 400
     
@@ -409,9 +410,7 @@ class TestSubmissionRoutes:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         # Should handle gracefully - either 400 or return error in result
         assert response.status_code in [200, 400]
@@ -422,30 +421,31 @@ class TestUserIdentificationRoutes:
     
     def setup_method(self):
         """Set up test client."""
-        app.config['TESTING'] = True
         self.client = app.test_client()
     
     def test_set_user_name_post(self):
         """Test setting user name via POST."""
-        response = self.client.post('/set_name', 
+        # No need to follow the redirect and re-render the homepage;
+        # the session state is what this test validates
+        response = self.client.post('/set_name',
                                   data={'user_name': 'TestUser'},
-                                  follow_redirects=True)
-        
-        assert response.status_code == 200
-        
+                                  follow_redirects=False)
+
+        assert response.status_code in (302, 303, 200)
+
         # Check if user name is stored in session
         with self.client.session_transaction() as sess:
             assert 'user_name' in sess
             assert sess['user_name'] == 'TestUser'
-    
+
     def test_set_empty_user_name(self):
         """Test setting empty user name."""
         response = self.client.post('/set_name',
                                   data={'user_name': ''},
-                                  follow_redirects=True)
-        
+                                  follow_redirects=False)
+
         # Should handle gracefully
-        assert response.status_code == 200
+        assert response.status_code in (302, 303, 200)
     
     def test_user_session_persistence(self):
         """Test that user session persists across requests."""
@@ -465,16 +465,14 @@ class TestSubmissionHistoryRoutes:
     
     def setup_method(self):
         """Set up test client and sample data."""
-        app.config['TESTING'] = True
         self.client = app.test_client()
         
         # Set up test database
         self.db_fd, self.db_path = tempfile.mkstemp()
         app.config['DATABASE'] = self.db_path
         
-        with app.app_context():
-            create_tables()
-            self._create_sample_submissions()
+        create_tables()
+        self._create_sample_submissions()
     
     def teardown_method(self):
         """Clean up test database."""
@@ -487,26 +485,19 @@ class TestSubmissionHistoryRoutes:
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO problems (title, description, difficulty, function_signatures, test_cases)
-            VALUES (?, ?, ?, ?, ?)
-        ''', ('Test Problem', 'Test Description', 'Easy', '{}', '[]'))
-        
+        cursor.execute(_INSERT_PROBLEM_SQL,
+                       ('Test Problem', 'Test Description', 'Easy', '{}', '[]'))
+
         # Then create submissions
         submissions = [
             ('TestUser', 1, 'python', 'def solution(): pass', 'PASS', 0.05),
             ('TestUser', 1, 'javascript', 'function solution() {}', 'FAIL', 0.03),
             ('AnotherUser', 1, 'python', 'def solution(): return 42', 'PASS', 0.02)
         ]
-        
-        for user_name, problem_id, language, code, status, execution_time in submissions:
-            cursor.execute('''
-                INSERT INTO submissions (user_name, problem_id, language, code, status, execution_time)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_name, problem_id, language, code, status, execution_time))
-        
+
+        cursor.executemany(_INSERT_SUBMISSION_SQL, submissions)
+
         conn.commit()
-        conn.close()
     
     def test_submissions_history_get(self):
         """Test GET request to submissions history."""
@@ -516,10 +507,11 @@ class TestSubmissionHistoryRoutes:
         
         response = self.client.get('/submissions')
         assert response.status_code == 200
-        
-        # Should show user's submissions
-        response_text = response.data.decode('utf-8')
-        assert 'TestUser' in response_text or 'python' in response_text
+
+        # Should show user's submissions; search the raw bytes instead of
+        # decoding the whole body into a throwaway str
+        body = response.data
+        assert body.find(b'TestUser') >= 0 or body.find(b'python') >= 0
     
     def test_submissions_history_empty_user(self):
         """Test submissions history for user with no submissions."""
@@ -538,40 +530,54 @@ class TestSubmissionHistoryRoutes:
         assert response.status_code in [200, 302]
 
 
-class TestLeaderboardRoutes:
-    """Test leaderboard functionality."""
-    
-    def setup_method(self):
-        """Set up test client and sample data."""
-        app.config['TESTING'] = True
-        self.client = app.test_client()
-        
+class TestLeaderboardSeeded:
+    """Test leaderboard functionality against seeded data.
+
+    The empty-database scenario lives in TestLeaderboardEmpty so the
+    seeded database can be shared untouched by every test here.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        """Set up shared test client and seed leaderboard data once."""
+        cls.client = app.test_client()
+
         # Set up test database
-        self.db_fd, self.db_path = tempfile.mkstemp()
-        app.config['DATABASE'] = self.db_path
-        
+        cls.db_fd, cls.db_path = tempfile.mkstemp()
+        app.config['DATABASE'] = cls.db_path
+
         with app.app_context():
             create_tables()
-            self._create_leaderboard_data()
-    
-    def teardown_method(self):
+            cls._create_leaderboard_data()
+
+    @classmethod
+    def teardown_class(cls):
         """Clean up test database."""
-        os.close(self.db_fd)
-        os.unlink(self.db_path)
-    
-    def _create_leaderboard_data(self):
+        os.close(cls.db_fd)
+        os.unlink(cls.db_path)
+
+    @classmethod
+    def _create_leaderboard_data(cls):
         """Create sample data for leaderboard testing."""
         conn = get_db_connection()
         cursor = conn.cursor()
-        
+
         # Create problems
-        for i in range(3):
-            cursor.execute('''
-                INSERT INTO problems (title, description, difficulty, function_signatures, test_cases)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (f'Problem {i+1}', f'Description {i+1}', 'Easy', '{}', '[]'))
-        
-        # Create successful submissions for different users
+        cursor.executemany(_INSERT_PROBLEM_SQL, [
+            (f'Problem {i+1}', f'Description {i+1}', 'Easy', '{}', '[]')
+            for i in range(3)
+        ])
+
+        conn.commit()
+
+        cls._seed_submissions()
+
+    @classmethod
+    def _seed_submissions(cls):
+        """Create successful submissions for different users."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
         submissions = [
             ('Alice', 1, 'python', 'code1', 'PASS', 0.05),
             ('Alice', 2, 'python', 'code2', 'PASS', 0.04),
@@ -581,25 +587,20 @@ class TestLeaderboardRoutes:
             ('Charlie', 1, 'python', 'code1', 'PASS', 0.08),
             ('Alice', 1, 'javascript', 'code1js', 'FAIL', 0.02),  # Failed submission
         ]
-        
-        for user_name, problem_id, language, code, status, execution_time in submissions:
-            cursor.execute('''
-                INSERT INTO submissions (user_name, problem_id, language, code, status, execution_time)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_name, problem_id, language, code, status, execution_time))
-        
+
+        cursor.executemany(_INSERT_SUBMISSION_SQL, submissions)
+
         conn.commit()
-        conn.close()
     
     def test_leaderboard_get(self):
         """Test GET request to leaderboard."""
         response = self.client.get('/leaderboard')
         assert response.status_code == 200
-        
-        response_text = response.data.decode('utf-8')
-        assert 'Alice' in response_text
-        assert 'Bob' in response_text
-        assert 'Charlie' in response_text
+
+        # Check the raw bytes directly; no decode needed
+        assert b'Alice' in response.data
+        assert b'Bob' in response.data
+        assert b'Charlie' in response.data
     
     def test_leaderboard_ranking_order(self):
         """Test that leaderboard shows users in correct order."""
@@ -614,29 +615,42 @@ class TestLeaderboardRoutes:
         assert alice_pos > 0
         assert bob_pos > 0
         assert charlie_pos > 0
-    
+
+
+class TestLeaderboardEmpty:
+    """Test leaderboard behaviour with no submissions."""
+
+    @classmethod
+    def setup_class(cls):
+        """Set up shared test client and an empty database."""
+        cls.client = app.test_client()
+
+        cls.db_fd, cls.db_path = tempfile.mkstemp()
+        app.config['DATABASE'] = cls.db_path
+
+        with app.app_context():
+            create_tables()
+
+    @classmethod
+    def teardown_class(cls):
+        """Clean up test database."""
+        os.close(cls.db_fd)
+        os.unlink(cls.db_path)
+
     def test_leaderboard_empty_database(self):
         """Test leaderboard with no submissions."""
-        # Clear all submissions
-        with app.app_context():
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM submissions')
-            conn.commit()
-            conn.close()
-        
         response = self.client.get('/leaderboard')
         assert response.status_code == 200
         # Should handle empty state gracefully
 
 
+@pytest.mark.skipif(form_validation is None,
+                    reason="form_validation module not available")
 class TestFormValidationIntegration:
     """Test integration with form validation system."""
     
     def setup_method(self):
         """Set up test client."""
-        app.config['TESTING'] = True
-        app.config['WTF_CSRF_ENABLED'] = False
         self.client = app.test_client()
     
     @patch('form_validation.validate_submission')
@@ -651,9 +665,7 @@ class TestFormValidationIntegration:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         # Validation should be called
         mock_validate.assert_called()
@@ -667,18 +679,20 @@ class TestFormValidationIntegration:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(dangerous_submission),
-                                  content_type='application/json')
+        response = _post_submit(self.client, dangerous_submission)
         
         # Should be blocked by security validation
         assert response.status_code in [400, 200]  # 200 if validation returns error in JSON
     
-    @patch('form_validation.RateLimiter.is_rate_limited')
-    def test_rate_limiting_integration(self, mock_rate_limit):
+    def test_rate_limiting_integration(self, monkeypatch):
         """Test rate limiting integration."""
-        mock_rate_limit.return_value = True
-        
+        # Patch the already-imported class directly; string targets make
+        # mock re-resolve the module on every patch start/stop.
+        monkeypatch.setattr(
+            form_validation.RateLimiter, 'is_rate_limited',
+            lambda self, *args, **kwargs: True
+        )
+
         submission_data = {
             'problem_id': 1,
             'language': 'python',
@@ -686,9 +700,7 @@ class TestFormValidationIntegration:
             'user_name': 'TestUser'
         }
         
-        response = self.client.post('/submit',
-                                  data=json.dumps(submission_data),
-                                  content_type='application/json')
+        response = _post_submit(self.client, submission_data)
         
         # Should be rate limited
         assert response.status_code in [429, 400, 200]
@@ -699,14 +711,19 @@ class TestErrorHandling:
     
     def setup_method(self):
         """Set up test client."""
-        app.config['TESTING'] = True
         self.client = app.test_client()
     
-    def test_404_error_handling(self):
-        """Test 404 error handling."""
-        response = self.client.get('/nonexistent-route')
-        assert response.status_code == 404
-    
+    @pytest.mark.parametrize('path, expected', [
+        ('/', 200),                    # Homepage renders even with empty DB
+        ('/nonexistent-route', 404),   # 404 handler
+        ('/problems', 200),
+        ('/leaderboard', 200),
+    ])
+    def test_get_status(self, path, expected):
+        """Test that routes return the expected status codes."""
+        response = self.client.get(path)
+        assert response.status_code == expected
+
     def test_500_error_handling(self):
         """Test 500 error handling."""
         # This is harder to test without causing actual errors
@@ -721,13 +738,6 @@ class TestErrorHandling:
                                   content_type='application/json')
         
         assert response.status_code == 400
-    
-    def test_database_error_handling(self):
-        """Test handling of database errors."""
-        # This test would require mocking database failures
-        # For now, we test that the application doesn't crash
-        response = self.client.get('/')
-        assert response.status_code == 200
 
 
 class TestSessionManagement:
@@ -735,7 +745,6 @@ class TestSessionManagement:
     
     def setup_method(self):
         """Set up test client."""
-        app.config['TESTING'] = True
         self.client = app.test_client()
     
     def test_session_cookie_settings(self):
@@ -5,8 +5,9 @@ Tests all components, API endpoints, and functionality
 """
 
 import pytest
-import json
 import time
+from types import SimpleNamespace
+from urllib.parse import quote_plus
 import sys
 import os
 from unittest.mock import patch, MagicMock
@@ -14,91 +15,158 @@ from unittest.mock import patch, MagicMock
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app import create_app
-from init_db import initialize_database
+import re
 
-# Import API helpers
-from api_helpers import (
-    get_real_system_info, get_mock_system_info, get_enhanced_platform_stats,
-    perform_health_checks, format_ascii_table, format_ascii_chart
+# Endpoints exercised by the sweep tests below
+ENDPOINTS = ('/api/system-info', '/api/platform-stats', '/api/health-check')
+
+# Malicious query strings for input validation, pre-encoded at import
+# so each parametrized case is a straight client.get
+_MALICIOUS_QUERIES = tuple(
+    '?param=' + quote_plus(value) for value in (
+        '<script>alert("xss")</script>',
+        '../../etc/passwd',
+        '; DROP TABLE users; --',
+        'A' * 10000,  # Very long parameter
+    )
 )
-from routes import sanitize_system_info
+
+# Required key sets for API payload shapes; one subset check per
+# sub-dict replaces a chain of individual membership asserts and shows
+# the missing keys on failure
+ENVELOPE_KEYS = frozenset({'status', 'data', 'metadata'})
+SYSTEM_INFO_KEYS = frozenset({'platform', 'performance', 'database', 'timestamp'})
+PLATFORM_KEYS = frozenset({'name', 'version', 'status', 'uptime'})
+PERFORMANCE_KEYS = frozenset({'cpu_usage', 'memory_usage', 'disk_usage'})
+DATABASE_KEYS = frozenset({'status', 'response_time', 'health'})
+STATS_KEYS = frozenset({'basic', 'languages', 'problems', 'activity'})
+BASIC_STATS_KEYS = frozenset({'total_problems', 'total_submissions',
+                              'total_users', 'success_rate'})
+HEALTH_KEYS = frozenset({'overall_status', 'checks', 'timestamp'})
+HEALTH_CHECK_NAMES = frozenset({'database', 'judge_engine', 'file_system'})
+
+# Static inputs for the ASCII formatting tests, shared across cases
+TABLE_HEADERS = ['Language', 'Submissions', 'Success Rate']
+TABLE_ROWS = [
+    ['Python', '3456', '72.3%'],
+    ['JavaScript', '2134', '68.7%'],
+    ['Java', '1876', '71.2%'],
+]
+CHART_DATA = {'Easy': 45, 'Medium': 35, 'Hard': 20}
+
+# One case-insensitive pass over the response body replaces a substring
+# scan (and a .lower() copy) per keyword
+SENSITIVE_RE = re.compile(
+    rb'password|secret|key|token|credential|SECRET_KEY|DATABASE_URL|API_KEY',
+    re.IGNORECASE)
+
+# Single alternation pass over the homepage HTML instead of one
+# str.__contains__ scan per focusable element name
+FOCUSABLE_RE = re.compile(r'<(?:button|input|select|textarea|a\s+href)')
+
+# App, database and helper imports are deferred into fixtures and test
+# bodies: they transitively pull Flask, psutil and the routes blueprint,
+# which would otherwise run on every collection (even with -k/--lf)
+
+
+@pytest.fixture(scope='session')
+def app(modal_app):
+    """Resolve app to the shared modal application from conftest."""
+    return modal_app
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    with app.test_client() as client:
+        with app.app_context():
+            yield client
+
+
+@pytest.fixture(scope='session')
+def raw_info_template():
+    """Canonical unsanitized system-info payload, built once per session.
+
+    Tests deep-copy it before handing it to sanitize_system_info, which
+    may mutate its argument.
+    """
+    return {
+        'platform': {
+            'name': 'CodeXam Elite Arena',
+            'version': '2.1.0',
+            'status': 'OPERATIONAL',
+            'uptime': '72h 15m',
+            'boot_time': '2025-01-01T00:00:00'  # Should be removed
+        },
+        'performance': {
+            'cpu_usage': 25.5,
+            'memory_usage': 45.2,
+            'memory_total': 16.0,  # Should be removed
+            'disk_total': 500.0    # Should be removed
+        },
+        'database': {
+            'status': 'CONNECTED',
+            'response_time': 2.5,
+            'connections': 15,     # Should be removed
+            'queries': 1247        # Should be removed
+        },
+        'timestamp': '2025-01-01T12:00:00'
+    }
+
+
+@pytest.fixture
+def failing_system_info():
+    """Patch get_real_system_info to raise, shared by error-path tests."""
+    with patch('api_helpers.get_real_system_info',
+               side_effect=Exception("Database connection failed")) as patched:
+        yield patched
+
+
+@pytest.fixture(scope='session')
+def homepage(app):
+    """Fetch and decode GET / once per session.
+
+    The integration and accessibility tests only do substring checks on
+    the rendered page, so one Jinja render serves them all.
+    """
+    with app.test_client() as client:
+        response = client.get('/')
+    return response.status_code, response.data.decode('utf-8')
+
+
+def _ok_json(client, url):
+    """GET url, assert a 200, and return the parsed JSON body."""
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get_json()
+
 
 class TestSystemInfoModalAPI:
     """Test suite for System Info Modal API endpoints."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(":memory:")
-                yield client
-    
     def test_system_info_endpoint(self, client):
         """Test /api/system-info endpoint."""
-        response = client.get('/api/system-info')
-        
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
+        data = _ok_json(client, '/api/system-info')
         assert data['status'] == 'success'
-        assert 'data' in data
-        assert 'metadata' in data
-        
-        # Check required fields in system info
+        assert ENVELOPE_KEYS <= data.keys()
+
+        # Check required fields in system info and each sub-section
         system_data = data['data']
-        assert 'platform' in system_data
-        assert 'performance' in system_data
-        assert 'database' in system_data
-        assert 'timestamp' in system_data
-        
-        # Check platform info
-        platform = system_data['platform']
-        assert 'name' in platform
-        assert 'version' in platform
-        assert 'status' in platform
-        assert 'uptime' in platform
-        
-        # Check performance info
-        performance = system_data['performance']
-        assert 'cpu_usage' in performance
-        assert 'memory_usage' in performance
-        assert 'disk_usage' in performance
-        
-        # Check database info
-        database = system_data['database']
-        assert 'status' in database
-        assert 'response_time' in database
-        assert 'health' in database
+        assert SYSTEM_INFO_KEYS <= system_data.keys()
+        assert PLATFORM_KEYS <= system_data['platform'].keys()
+        assert PERFORMANCE_KEYS <= system_data['performance'].keys()
+        assert DATABASE_KEYS <= system_data['database'].keys()
     
     def test_platform_stats_endpoint(self, client):
         """Test /api/platform-stats endpoint."""
-        response = client.get('/api/platform-stats')
-        
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
+        data = _ok_json(client, '/api/platform-stats')
         assert data['status'] == 'success'
-        assert 'data' in data
-        assert 'metadata' in data
-        
-        # Check required fields in platform stats
+        assert ENVELOPE_KEYS <= data.keys()
+
+        # Check required fields in platform stats and the basic block
         stats_data = data['data']
-        assert 'basic' in stats_data
-        assert 'languages' in stats_data
-        assert 'problems' in stats_data
-        assert 'activity' in stats_data
-        
-        # Check basic stats
-        basic = stats_data['basic']
-        assert 'total_problems' in basic
-        assert 'total_submissions' in basic
-        assert 'total_users' in basic
-        assert 'success_rate' in basic
+        assert STATS_KEYS <= stats_data.keys()
+        assert BASIC_STATS_KEYS <= stats_data['basic'].keys()
         
         # Check language stats
         languages = stats_data['languages']
@@ -112,26 +180,16 @@ class TestSystemInfoModalAPI:
     
     def test_health_check_endpoint(self, client):
         """Test /api/health-check endpoint."""
-        response = client.get('/api/health-check')
-        
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
+        data = _ok_json(client, '/api/health-check')
         assert data['status'] == 'success'
-        assert 'data' in data
-        assert 'metadata' in data
-        
-        # Check health check data
+        assert ENVELOPE_KEYS <= data.keys()
+
+        # Check health check data and the individual checks
         health_data = data['data']
-        assert 'overall_status' in health_data
-        assert 'checks' in health_data
-        assert 'timestamp' in health_data
-        
-        # Check individual health checks
+        assert HEALTH_KEYS <= health_data.keys()
+
         checks = health_data['checks']
-        assert 'database' in checks
-        assert 'judge_engine' in checks
-        assert 'file_system' in checks
+        assert HEALTH_CHECK_NAMES <= checks.keys()
         
         # Each check should have status and response_time
         for check_name, check_data in checks.items():
@@ -149,57 +207,56 @@ class TestSystemInfoModalAPI:
         # Should still work but ignore invalid params
         assert response.status_code == 200
     
-    def test_api_response_format(self, client):
+    @pytest.mark.parametrize('endpoint', ENDPOINTS)
+    def test_api_response_format(self, client, endpoint):
         """Test consistent API response format."""
-        endpoints = ['/api/system-info', '/api/platform-stats', '/api/health-check']
-        
-        for endpoint in endpoints:
-            response = client.get(endpoint)
-            assert response.status_code == 200
-            
-            data = json.loads(response.data)
-            
-            # Check standard response structure
-            assert 'status' in data
-            assert 'data' in data
-            assert 'metadata' in data
-            
-            # Check metadata structure
-            metadata = data['metadata']
-            assert 'timestamp' in metadata
-            # Different endpoints may have different metadata fields
-            # Just check that some version info exists
-            has_version = 'version' in metadata or 'api_version' in metadata
-            assert has_version, f"No version info in metadata: {metadata}"
+        data = _ok_json(client, endpoint)
+
+        # Check standard response structure
+        assert 'status' in data
+        assert 'data' in data
+        assert 'metadata' in data
+
+        # Check metadata structure
+        metadata = data['metadata']
+        assert 'timestamp' in metadata
+        # Different endpoints may have different metadata fields
+        # Just check that some version info exists
+        has_version = 'version' in metadata or 'api_version' in metadata
+        assert has_version, f"No version info in metadata: {metadata}"
 
 
 class TestSystemInfoHelpers:
     """Test suite for system info helper functions."""
     
-    def test_get_real_system_info(self):
+    # SimpleNamespace return values avoid building MagicMocks that only
+    # carry a single attribute
+    @patch('psutil.boot_time', return_value=time.time() - 3600)
+    @patch('psutil.disk_usage', return_value=SimpleNamespace(percent=12.8))
+    @patch('psutil.virtual_memory', return_value=SimpleNamespace(percent=45.2))
+    @patch('psutil.cpu_percent', return_value=25.5)
+    def test_get_real_system_info(self, mock_cpu, mock_memory, mock_disk,
+                                  mock_boot):
         """Test real system info retrieval."""
-        with patch('psutil.cpu_percent', return_value=25.5):
-            with patch('psutil.virtual_memory') as mock_memory:
-                mock_memory.return_value.percent = 45.2
-                with patch('psutil.disk_usage') as mock_disk:
-                    mock_disk.return_value.percent = 12.8
-                    with patch('psutil.boot_time', return_value=time.time() - 3600):
-                        
-                        info = get_real_system_info()
-                        
-                        assert 'platform' in info
-                        assert 'performance' in info
-                        assert 'database' in info
-                        assert 'timestamp' in info
-                        
-                        # Check performance data
-                        perf = info['performance']
-                        assert perf['cpu_usage'] == 25.5
-                        assert perf['memory_usage'] == 45.2
-                        assert perf['disk_usage'] == 12.8
+        from api_helpers import get_real_system_info
+
+        info = get_real_system_info()
+
+        assert 'platform' in info
+        assert 'performance' in info
+        assert 'database' in info
+        assert 'timestamp' in info
+
+        # Check performance data
+        perf = info['performance']
+        assert perf['cpu_usage'] == 25.5
+        assert perf['memory_usage'] == 45.2
+        assert perf['disk_usage'] == 12.8
     
     def test_get_mock_system_info(self):
         """Test mock system info generation."""
+        from api_helpers import get_mock_system_info
+
         info = get_mock_system_info()
         
         assert 'platform' in info
@@ -215,6 +272,8 @@ class TestSystemInfoHelpers:
     
     def test_get_enhanced_platform_stats(self):
         """Test enhanced platform statistics."""
+        from api_helpers import get_enhanced_platform_stats
+
         with patch('models.Problem') as mock_problem:
             with patch('models.Submission') as mock_submission:
                 # Mock database queries
@@ -236,6 +295,8 @@ class TestSystemInfoHelpers:
     
     def test_perform_health_checks(self):
         """Test health check functionality."""
+        from api_helpers import perform_health_checks
+
         with patch('database.get_db') as mock_db:
             mock_db.return_value.execute.return_value.fetchone.return_value = (1,)
             
@@ -250,31 +311,14 @@ class TestSystemInfoHelpers:
             assert 'database' in checks
             # Note: Other checks may vary based on system configuration
     
-    def test_sanitize_system_info(self):
+    def test_sanitize_system_info(self, raw_info_template):
         """Test system info sanitization."""
-        raw_info = {
-            'platform': {
-                'name': 'CodeXam Elite Arena',
-                'version': '2.1.0',
-                'status': 'OPERATIONAL',
-                'uptime': '72h 15m',
-                'boot_time': '2025-01-01T00:00:00'  # Should be removed
-            },
-            'performance': {
-                'cpu_usage': 25.5,
-                'memory_usage': 45.2,
-                'memory_total': 16.0,  # Should be removed
-                'disk_total': 500.0    # Should be removed
-            },
-            'database': {
-                'status': 'CONNECTED',
-                'response_time': 2.5,
-                'connections': 15,     # Should be removed
-                'queries': 1247        # Should be removed
-            },
-            'timestamp': '2025-01-01T12:00:00'
-        }
-        
+        import copy
+
+        from routes import sanitize_system_info
+
+        raw_info = copy.deepcopy(raw_info_template)
+
         sanitized = sanitize_system_info(raw_info)
         
         # Check that sensitive data is removed/sanitized
@@ -290,14 +334,9 @@ class TestSystemInfoHelpers:
     
     def test_format_ascii_table(self):
         """Test ASCII table formatting."""
-        headers = ['Language', 'Submissions', 'Success Rate']
-        data = [
-            ['Python', '3456', '72.3%'],
-            ['JavaScript', '2134', '68.7%'],
-            ['Java', '1876', '71.2%']
-        ]
-        
-        table = format_ascii_table(data, headers)
+        from api_helpers import format_ascii_table
+
+        table = format_ascii_table(TABLE_ROWS, TABLE_HEADERS)
         
         assert isinstance(table, str)
         assert 'Language' in table
@@ -311,13 +350,10 @@ class TestSystemInfoHelpers:
     
     def test_format_ascii_chart(self):
         """Test ASCII chart formatting."""
-        data = {
-            'Easy': 45,
-            'Medium': 35,
-            'Hard': 20
-        }
-        
-        chart = format_ascii_chart(data, title="Problem Difficulty Distribution")
+        from api_helpers import format_ascii_chart
+
+        chart = format_ascii_chart(CHART_DATA,
+                                   title="Problem Difficulty Distribution")
         
         assert isinstance(chart, str)
         assert 'Problem Difficulty Distribution' in chart
@@ -332,24 +368,11 @@ class TestSystemInfoHelpers:
 class TestSystemInfoModalIntegration:
     """Test suite for system info modal integration."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(":memory:")
-                yield client
-    
-    def test_modal_html_structure(self, client):
+    def test_modal_html_structure(self, homepage):
         """Test that modal HTML structure is present in templates."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for modal container
         assert 'systemInfoModal' in html_content
         assert 'system-info-modal' in html_content
@@ -360,20 +383,16 @@ class TestSystemInfoModalIntegration:
         # Check for close button
         assert 'terminal-close-btn' in html_content
     
-    def test_modal_css_inclusion(self, client):
+    def test_modal_css_inclusion(self, homepage):
         """Test that modal CSS is included."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
+        status, html_content = homepage
+        assert status == 200
         assert 'system-info-modal.css' in html_content
     
-    def test_modal_js_inclusion(self, client):
+    def test_modal_js_inclusion(self, homepage):
         """Test that modal JavaScript is included."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
+        status, html_content = homepage
+        assert status == 200
         assert 'system-info-modal.js' in html_content
     
     def test_static_files_accessible(self, client):
@@ -388,23 +407,19 @@ class TestSystemInfoModalIntegration:
         assert response.status_code == 200
         assert 'javascript' in response.content_type or 'text/plain' in response.content_type
     
-    def test_system_info_button_integration(self, client):
+    def test_system_info_button_integration(self, homepage):
         """Test that system info button is properly integrated."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for system info button
         assert 'showSystemInfoModal' in html_content or 'system-info-btn' in html_content
     
-    def test_modal_accessibility_attributes(self, client):
+    def test_modal_accessibility_attributes(self, homepage):
         """Test that modal has proper accessibility attributes."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for ARIA attributes
         assert 'aria-hidden' in html_content
         assert 'role="dialog"' in html_content
@@ -413,220 +428,143 @@ class TestSystemInfoModalIntegration:
 
 class TestSystemInfoModalPerformance:
     """Test suite for system info modal performance."""
+
+    # Intrinsically slower tests: keep them off the fast workers under
+    # pytest -n auto --dist loadscope
+    pytestmark = pytest.mark.slow
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(":memory:")
-                yield client
-    
-    def test_api_response_time(self, client):
+    @pytest.mark.parametrize('endpoint', ENDPOINTS)
+    def test_api_response_time(self, client, endpoint):
         """Test that API endpoints respond within acceptable time."""
-        endpoints = ['/api/system-info', '/api/platform-stats', '/api/health-check']
-        
-        for endpoint in endpoints:
-            start_time = time.time()
-            response = client.get(endpoint)
-            end_time = time.time()
-            
-            response_time = end_time - start_time
-            
-            assert response.status_code == 200
-            assert response_time < 1.0  # Should respond within 1 second
+        start_time = time.time()
+        response = client.get(endpoint)
+        end_time = time.time()
+
+        response_time = end_time - start_time
+
+        assert response.status_code == 200
+        assert response_time < 1.0  # Should respond within 1 second
     
     def test_concurrent_requests(self, client):
         """Test handling of concurrent requests."""
-        import threading
-        import queue
-        
-        results = queue.Queue()
-        
-        def make_request():
-            try:
-                response = client.get('/api/system-info')
-                results.put(response.status_code)
-            except Exception as e:
-                results.put(str(e))
-        
-        # Create multiple threads
-        threads = []
-        for _ in range(5):
-            thread = threading.Thread(target=make_request)
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
-        # Check results
-        while not results.empty():
-            result = results.get()
-            assert result == 200
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The test client serializes under the GIL anyway; a pooled map
+        # keeps the overlap deterministic without per-request threads
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            statuses = list(executor.map(
+                lambda _: client.get('/api/system-info').status_code,
+                range(5)))
+
+        assert all(status == 200 for status in statuses)
     
     def test_memory_usage(self, client):
         """Test that modal doesn't cause memory leaks."""
-        import gc
-        
-        # Get initial memory usage
-        gc.collect()
-        initial_objects = len(gc.get_objects())
-        
-        # Make multiple requests
-        for _ in range(10):
-            response = client.get('/api/system-info')
-            assert response.status_code == 200
-        
-        # Force garbage collection
-        gc.collect()
-        final_objects = len(gc.get_objects())
-        
-        # Check that object count hasn't grown significantly
-        object_growth = final_objects - initial_objects
-        assert object_growth < 100  # Allow some growth but not excessive
+        import tracemalloc
+
+        # tracemalloc snapshot diffs avoid gc.get_objects(), which walks
+        # the entire heap twice and dominates this test's runtime
+        tracemalloc.start()
+        try:
+            # Warm-up request so lazy imports/caches are not counted
+            assert client.get('/api/system-info').status_code == 200
+            before = tracemalloc.take_snapshot()
+
+            for _ in range(10):
+                response = client.get('/api/system-info')
+                assert response.status_code == 200
+
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        growth = sum(stat.size_diff
+                     for stat in after.compare_to(before, 'filename'))
+        assert growth < 1024 * 1024  # Allow some growth but not excessive
 
 
 class TestSystemInfoModalSecurity:
     """Test suite for system info modal security."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(":memory:")
-                yield client
-    
     def test_sensitive_data_filtering(self, client):
         """Test that sensitive data is filtered from responses."""
         response = client.get('/api/system-info')
         assert response.status_code == 200
-        
-        data = json.loads(response.data)
-        response_text = json.dumps(data)
-        
-        # Check that sensitive keywords are not present
-        sensitive_keywords = [
-            'password', 'secret', 'key', 'token', 'credential',
-            'SECRET_KEY', 'DATABASE_URL', 'API_KEY'
-        ]
-        
-        for keyword in sensitive_keywords:
-            assert keyword.lower() not in response_text.lower()
+
+        # Scan the raw bytes directly; no decode/re-encode round-trip
+        assert not SENSITIVE_RE.search(response.data)
     
-    def test_input_validation(self, client):
+    @pytest.mark.parametrize('query', _MALICIOUS_QUERIES)
+    def test_input_validation(self, client, query):
         """Test input validation for API endpoints."""
-        # Test with malicious parameters
-        malicious_params = [
-            '?param=<script>alert("xss")</script>',
-            '?param=../../etc/passwd',
-            '?param=; DROP TABLE users; --',
-            '?param=' + 'A' * 10000  # Very long parameter
-        ]
-        
-        for param in malicious_params:
-            response = client.get(f'/api/system-info{param}')
-            # Should either ignore the parameter or return 400, but not crash
-            assert response.status_code in [200, 400]
+        response = client.get(f'/api/system-info{query}')
+        # Should either ignore the parameter or return 400, but not crash
+        assert response.status_code in [200, 400]
     
+    @pytest.mark.slow
     def test_rate_limiting_simulation(self, client):
         """Test rate limiting behavior (simulated)."""
-        # Make rapid requests
-        responses = []
-        for _ in range(20):
-            response = client.get('/api/system-info')
-            responses.append(response.status_code)
-        
-        # All requests should succeed in test environment
-        # In production, rate limiting would kick in
-        assert all(status == 200 for status in responses)
+        # In the test environment requests always succeed (rate limiting
+        # only kicks in in production), so 20 identical calls proved
+        # nothing more than a couple do
+        for _ in range(2):
+            assert client.get('/api/system-info').status_code == 200
     
-    def test_error_information_disclosure(self, client):
+    def test_error_information_disclosure(self, client, failing_system_info):
         """Test that errors don't disclose sensitive information."""
-        # Try to trigger an error
-        with patch('api_helpers.get_real_system_info', side_effect=Exception("Database connection failed")):
-            response = client.get('/api/system-info')
-            
-            # Should return error but not expose internal details
-            if response.status_code != 200:
-                data = json.loads(response.data)
-                error_message = data.get('message', '').lower()
-                
-                # Should not contain file paths or internal details
-                assert '/home/' not in error_message
-                assert 'traceback' not in error_message
-                assert 'exception' not in error_message
+        response = client.get('/api/system-info')
+
+        # Should return error but not expose internal details
+        if response.status_code != 200:
+            data = response.get_json()
+            error_message = data.get('message', '').lower()
+
+            # Should not contain file paths or internal details
+            assert '/home/' not in error_message
+            assert 'traceback' not in error_message
+            assert 'exception' not in error_message
 
 
 class TestSystemInfoModalAccessibility:
     """Test suite for system info modal accessibility."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(":memory:")
-                yield client
-    
-    def test_aria_attributes(self, client):
+    def test_aria_attributes(self, homepage):
         """Test that proper ARIA attributes are present."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for required ARIA attributes
         assert 'aria-hidden' in html_content
         assert 'role="dialog"' in html_content
         assert 'aria-modal="true"' in html_content
         assert 'aria-labelledby' in html_content or 'aria-label' in html_content
     
-    def test_keyboard_navigation_support(self, client):
+    def test_keyboard_navigation_support(self, homepage):
         """Test that keyboard navigation is supported."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for tabindex attributes
         assert 'tabindex' in html_content
         
         # Check for keyboard event handling
         assert 'keydown' in html_content or 'onkeydown' in html_content
     
-    def test_screen_reader_support(self, client):
+    def test_screen_reader_support(self, homepage):
         """Test screen reader support elements."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for screen reader only content
         assert 'sr-only' in html_content or 'visually-hidden' in html_content
     
-    def test_focus_management(self, client):
+    def test_focus_management(self, homepage):
         """Test focus management in modal."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        html_content = response.data.decode('utf-8')
-        
+        status, html_content = homepage
+        assert status == 200
+
         # Check for focusable elements
-        focusable_elements = ['button', 'input', 'select', 'textarea', 'a href']
-        has_focusable = any(element in html_content for element in focusable_elements)
-        assert has_focusable
+        assert FOCUSABLE_RE.search(html_content)
 
 
 if __name__ == '__main__':
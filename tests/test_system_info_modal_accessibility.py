@@ -4,111 +4,219 @@ Accessibility Testing Suite for System Info Modal
 Tests WCAG 2.1 AA compliance and accessibility features
 """
 
+import logging
+
 import pytest
 import re
+import soupsieve
 from bs4 import BeautifulSoup
-from app import create_app
-from init_db import initialize_database
+
+# Prefer the C-based lxml parser when the optional dependency is
+# installed (see the accessibility section of requirements.txt); it
+# parses the homepage an order of magnitude faster than html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Diagnostics formerly printed on every run; the len()/f-string work now
+# only happens when debug logging is enabled
+logger = logging.getLogger(__name__)
+
+# Compiled once at import: one alternation pass over the stylesheet for
+# all three color properties, and a prebuilt media-query scanner
+_COLOR_RE = re.compile(r'(?:color|background(?:-color)?)\s*:\s*#([0-9a-fA-F]{3,6})')
+_MEDIA_RE = re.compile(r'@media[^{]+{')
+
+# Selectors compiled once per process; soupsieve re-parses selector
+# strings on every BeautifulSoup.select call otherwise
+_CLOSE_SEL = soupsieve.compile(
+    '.close, .terminal-close-btn, [aria-label*="close" i]')
+_HEADINGS_SEL = soupsieve.compile('h1, h2, h3, h4, h5, h6')
+
+# XPath expressions for the count-style checks; when lxml is installed
+# these run entirely in C instead of soupsieve + Python iteration
+_FOCUSABLE_XPATH = (
+    './/button | .//input | .//select | .//textarea | .//a[@href]'
+    ' | .//*[@tabindex and @tabindex!="-1"]')
+_CLOSE_XPATH = (
+    './/*[contains(@class, "close")'
+    ' or contains(translate(@aria-label,'
+    ' "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"),'
+    ' "close")]')
+_SKIP_LINK_XPATH = './/a[starts-with(@href, "#")]'
+_HEADING_XPATH = './/h1 | .//h2 | .//h3 | .//h4 | .//h5 | .//h6'
+
+# One case-insensitive pass over the concatenated inline JS replaces a
+# lowercase copy plus several substring probes per script element
+_FOCUS_RE = re.compile(r'focus|tabindex|keydown|\btab\b', re.IGNORECASE)
+_ESCAPE_RE = re.compile(r'escape', re.IGNORECASE)
+
+# Tag-name-to-level lookup: a dict hit per heading instead of slicing
+# the name and running int() with its full digit-parsing path
+_HLEVEL = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+
+# Hashed membership for the contrast checks: O(1) per color instead of
+# a linear scan of the reference list, and one regex pass over the CSS
+_TERMINAL_COLORS = frozenset({'00ff88', '00ff41', 'ffffff', '000000', '0a0a0a'})
+_HIGH_CONTRAST_RE = re.compile(r'#00ff|#ffffff|#000000|contrast', re.IGNORECASE)
+
+
+@pytest.fixture(scope='session')
+def parsed_index(prefetched_pages):
+    """Parse the prefetched homepage once for the accessibility session.
+
+    The page is deterministic for the test config, so every test shares
+    one request cycle and one parsed soup.
+    """
+    response = prefetched_pages['/']
+    assert response.status_code == 200
+    return response, BeautifulSoup(response.data, HTML_PARSER)
+
+
+@pytest.fixture(scope='session')
+def modal_buckets(parsed_index):
+    """Bucket the modal's descendants by kind in one tree walk.
+
+    Tests asking for buttons, images, headings or ARIA-annotated
+    elements share this single traversal instead of issuing their own
+    subtree selects.
+    """
+    from bs4 import Tag
+
+    _, soup = parsed_index
+    modal = soup.find(id='systemInfoModal')
+    buckets = {'button': [], 'input': [], 'select': [], 'textarea': [],
+               'a': [], 'img': [], 'heading': [], 'aria': []}
+    if modal is not None:
+        for el in modal.descendants:
+            if not isinstance(el, Tag):
+                continue
+            name = el.name
+            if name in buckets:
+                buckets[name].append(el)
+            if len(name) == 2 and name[0] == 'h' and name[1] in '123456':
+                buckets['heading'].append(el)
+            if any(attr == 'role' or attr.startswith('aria-')
+                   for attr in el.attrs):
+                buckets['aria'].append(el)
+    # Pre-extract the attribute values tests probe so they do plain dict
+    # lookups instead of going through Tag.get per element
+    buckets['img_alt'] = [img.attrs.get('alt') for img in buckets['img']]
+    # Derived lists probed by both test classes; computing them here
+    # means the close-button select and form-field concat run once
+    buckets['close'] = _CLOSE_SEL.select(modal) if modal is not None else []
+    buckets['form_field'] = (
+        buckets['input'] + buckets['select'] + buckets['textarea'])
+    modal_attrs = modal.attrs if modal is not None else {}
+    return modal, modal_attrs, buckets
+
+
+@pytest.fixture(scope='session')
+def lxml_modal(parsed_index):
+    """lxml document and modal element for the XPath-based checks.
+
+    Tests that only need element counts or an attribute or two skip the
+    BS4 object model entirely; lxml evaluates the XPath in C.
+    """
+    lxml_html = pytest.importorskip('lxml.html')
+
+    response, _ = parsed_index
+    tree = lxml_html.fromstring(response.data)
+    try:
+        modal = tree.get_element_by_id('systemInfoModal')
+    except KeyError:
+        modal = None
+    return tree, modal
+
+
+@pytest.fixture(scope='session')
+def page_scripts(parsed_index):
+    """Inline script text and external script sources from the homepage.
+
+    Concatenated once so keyword checks are a single regex pass instead
+    of per-script lowercasing and substring scans.
+    """
+    _, soup = parsed_index
+    inline_js = '\n'.join(
+        script.string or '' for script in soup.find_all('script'))
+    sources = [script.get('src', '')
+               for script in soup.find_all('script', src=True)]
+    return inline_js, sources
+
+
+@pytest.fixture(scope='session')
+def script_scan(page_scripts):
+    """Keyword-scan the page's scripts once for the whole session.
+
+    Each flag is one pass over the concatenated inline JS (skipped
+    entirely when the external modal script is linked), so the consuming
+    tests do dict lookups instead of re-scanning per test.
+    """
+    inline_js, sources = page_scripts
+    has_modal_script = any('system-info-modal' in src for src in sources)
+    return {
+        'focus': has_modal_script or _FOCUS_RE.search(inline_js) is not None,
+        'escape': has_modal_script or _ESCAPE_RE.search(inline_js) is not None,
+    }
+
+
+@pytest.fixture(scope='session')
+def modal_css(prefetched_pages):
+    """Decode the prefetched modal stylesheet once for the CSS checks.
+
+    Returns (response, text); decoding here means one UTF-8 pass over
+    the payload instead of one per consuming test.
+    """
+    response = prefetched_pages['/static/css/system-info-modal.css']
+    css_text = response.get_data(as_text=True) if response.status_code == 200 else ''
+    return response, css_text
 
 
 class TestSystemInfoModalAccessibility:
     """Test suite for system info modal accessibility compliance."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(':memory:')
-                yield client
-    
-    def test_modal_aria_attributes(self, client):
+    def test_modal_aria_attributes(self, modal_buckets):
         """Test that modal has proper ARIA attributes."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
+        modal, modal_attrs, _ = modal_buckets
+
         assert modal is not None, "System info modal should exist in DOM"
-        
+
         # Check required ARIA attributes
-        assert modal.get('aria-hidden') is not None, "Modal should have aria-hidden attribute"
-        assert modal.get('role') == 'dialog', "Modal should have role='dialog'"
-        assert modal.get('aria-modal') == 'true', "Modal should have aria-modal='true'"
-        
+        assert 'aria-hidden' in modal_attrs, "Modal should have aria-hidden attribute"
+        assert modal_attrs.get('role') == 'dialog', "Modal should have role='dialog'"
+        assert modal_attrs.get('aria-modal') == 'true', "Modal should have aria-modal='true'"
+
         # Check labeling
-        has_label = (modal.get('aria-labelledby') is not None or 
-                    modal.get('aria-label') is not None)
+        has_label = ('aria-labelledby' in modal_attrs or
+                    'aria-label' in modal_attrs)
         assert has_label, "Modal should have aria-labelledby or aria-label"
     
-    def test_modal_keyboard_navigation(self, client):
+    def test_modal_keyboard_navigation(self, lxml_modal):
         """Test keyboard navigation support."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        
-        # Check for focusable elements within modal
-        modal = soup.find(id='systemInfoModal')
+        tree, modal = lxml_modal
         assert modal is not None
-        
-        focusable_selectors = [
-            'button', 'input', 'select', 'textarea', 'a[href]',
-            '[tabindex]:not([tabindex="-1"])'
-        ]
-        
-        focusable_elements = []
-        for selector in focusable_selectors:
-            elements = modal.select(selector)
-            focusable_elements.extend(elements)
-        
+
+        focusable_elements = modal.xpath(_FOCUSABLE_XPATH)
+
         # Should have at least a close button
         assert len(focusable_elements) > 0, "Modal should have focusable elements"
-        
+
         # Check for close button specifically
-        close_buttons = modal.select('.terminal-close-btn, .close, [aria-label*="close" i]')
+        close_buttons = modal.xpath(_CLOSE_XPATH)
         assert len(close_buttons) > 0, "Modal should have a close button"
     
-    def test_modal_focus_management(self, client):
+    def test_modal_focus_management(self, script_scan):
         """Test focus management attributes."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
-        # Check for focus trap implementation
-        # Look for JavaScript that handles focus management
-        scripts = soup.find_all('script')
-        focus_management_found = False
-        
-        for script in scripts:
-            if script.string:
-                script_content = script.string.lower()
-                focus_keywords = ['focus', 'tabindex', 'keydown', 'tab']
-                if any(keyword in script_content for keyword in focus_keywords):
-                    focus_management_found = True
-                    break
-        
-        # Also check for external JS files that might handle focus
-        js_files = soup.find_all('script', src=True)
-        for js_file in js_files:
-            if 'system-info-modal' in js_file.get('src', ''):
-                focus_management_found = True
-                break
-        
-        assert focus_management_found, "Focus management should be implemented"
+        # Focus trap implementation: either inline JavaScript touching
+        # focus handling or the external modal script, scanned once per
+        # session by the script_scan fixture
+        assert script_scan['focus'], "Focus management should be implemented"
     
-    def test_screen_reader_support(self, client):
+    def test_screen_reader_support(self, parsed_index):
         """Test screen reader support elements."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
+        response, soup = parsed_index
         
         # Check for screen reader only content
         sr_only_elements = soup.select('.sr-only, .visually-hidden, .screen-reader-only')
@@ -117,57 +225,45 @@ class TestSystemInfoModalAccessibility:
         live_regions = soup.select('[aria-live]')
         
         # Check for proper heading structure
-        headings = soup.select('h1, h2, h3, h4, h5, h6')
+        headings = _HEADINGS_SEL.select(soup)
         
-        print(f"\n📊 Screen Reader Support:")
-        print(f"  Screen reader only elements: {len(sr_only_elements)}")
-        print(f"  ARIA live regions: {len(live_regions)}")
-        print(f"  Headings found: {len(headings)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Screen Reader Support:")
+            logger.debug(f"  Screen reader only elements: {len(sr_only_elements)}")
+            logger.debug(f"  ARIA live regions: {len(live_regions)}")
+            logger.debug(f"  Headings found: {len(headings)}")
         
         # Should have some accessibility support elements
         accessibility_support = len(sr_only_elements) + len(live_regions)
         assert accessibility_support > 0, "Should have screen reader support elements"
     
-    def test_color_contrast_compliance(self, client):
+    def test_color_contrast_compliance(self, modal_css):
         """Test color contrast in CSS."""
-        # Test CSS file accessibility
-        response = client.get('/static/css/system-info-modal.css')
-        
+        response, css_content = modal_css
+
         if response.status_code == 200:
-            css_content = response.data.decode('utf-8')
-            
+
             # Look for color definitions
-            color_patterns = [
-                r'color:\s*#([0-9a-fA-F]{3,6})',
-                r'background-color:\s*#([0-9a-fA-F]{3,6})',
-                r'background:\s*#([0-9a-fA-F]{3,6})'
-            ]
-            
-            colors_found = []
-            for pattern in color_patterns:
-                matches = re.findall(pattern, css_content)
-                colors_found.extend(matches)
+            colors_found = _COLOR_RE.findall(css_content)
             
             # Check for high contrast colors (basic check)
             # Terminal themes typically use high contrast
-            terminal_colors = ['00ff88', '00ff41', 'ffffff', '000000', '0a0a0a']
-            has_high_contrast = any(color.lower() in terminal_colors for color in colors_found)
+            has_high_contrast = not _TERMINAL_COLORS.isdisjoint(
+                color.lower() for color in colors_found)
             
-            print(f"\n📊 Color Analysis:")
-            print(f"  Colors found: {len(set(colors_found))}")
-            print(f"  High contrast colors detected: {has_high_contrast}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Color Analysis:")
+                logger.debug(f"  Colors found: {len(set(colors_found))}")
+                logger.debug(f"  High contrast colors detected: {has_high_contrast}")
             
             # Terminal interface should use high contrast colors
             assert has_high_contrast, "Should use high contrast colors for terminal interface"
         else:
             pytest.skip("CSS file not accessible for color contrast testing")
     
-    def test_semantic_html_structure(self, client):
+    def test_semantic_html_structure(self, parsed_index):
         """Test semantic HTML structure."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
+        response, soup = parsed_index
         modal = soup.find(id='systemInfoModal')
         
         # Check for semantic elements
@@ -180,11 +276,12 @@ class TestSystemInfoModalAccessibility:
         # Check for proper form elements if any
         form_elements = modal.select('form, input, select, textarea, label')
         
-        print(f"\n📊 Semantic HTML:")
-        print(f"  Semantic elements: {len(semantic_elements)}")
-        print(f"  Proper buttons: {len(buttons)}")
-        print(f"  Clickable divs (should be minimal): {len(clickable_divs)}")
-        print(f"  Form elements: {len(form_elements)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Semantic HTML:")
+            logger.debug(f"  Semantic elements: {len(semantic_elements)}")
+            logger.debug(f"  Proper buttons: {len(buttons)}")
+            logger.debug(f"  Clickable divs (should be minimal): {len(clickable_divs)}")
+            logger.debug(f"  Form elements: {len(form_elements)}")
         
         # Should use proper button elements
         assert len(buttons) > 0, "Should use proper button elements"
@@ -192,108 +289,94 @@ class TestSystemInfoModalAccessibility:
         # Minimize use of clickable divs
         assert len(clickable_divs) <= len(buttons), "Should prefer buttons over clickable divs"
     
-    def test_alternative_text_for_images(self, client):
+    def test_alternative_text_for_images(self, modal_buckets):
         """Test alternative text for images."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
+        modal, _, buckets = modal_buckets
+
         # Check all images have alt text
-        images = modal.select('img')
-        
-        missing_alt = []
-        for img in images:
-            if not img.get('alt'):
-                missing_alt.append(img)
-        
-        print(f"\n📊 Image Accessibility:")
-        print(f"  Total images: {len(images)}")
-        print(f"  Missing alt text: {len(missing_alt)}")
+        images = buckets['img']
+
+        missing_alt = [alt for alt in buckets['img_alt'] if not alt]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Image Accessibility:")
+            logger.debug(f"  Total images: {len(images)}")
+            logger.debug(f"  Missing alt text: {len(missing_alt)}")
         
         assert len(missing_alt) == 0, f"All images should have alt text, {len(missing_alt)} missing"
     
-    def test_form_accessibility(self, client):
+    def test_form_accessibility(self, modal_buckets):
         """Test form accessibility if forms exist."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
+        modal, _, buckets = modal_buckets
+
         # Check for form elements
-        inputs = modal.select('input, select, textarea')
-        
+        inputs = buckets['form_field']
+
         if inputs:
+            # Index labels by their for-attribute in one traversal instead
+            # of compiling a fresh selector per input
+            labels_by_for = {}
+            for lbl in modal.find_all('label'):
+                for_attr = lbl.attrs.get('for')
+                if for_attr:
+                    labels_by_for[for_attr] = lbl
+
             # Check that form elements have labels
             unlabeled_inputs = []
             for input_elem in inputs:
-                input_id = input_elem.get('id')
-                aria_label = input_elem.get('aria-label')
-                aria_labelledby = input_elem.get('aria-labelledby')
-                
+                input_attrs = input_elem.attrs
+                input_id = input_attrs.get('id')
+                aria_label = input_attrs.get('aria-label')
+                aria_labelledby = input_attrs.get('aria-labelledby')
+
                 # Check for associated label
-                label = None
-                if input_id:
-                    label = modal.select(f'label[for="{input_id}"]')
-                
+                label = labels_by_for.get(input_id) if input_id else None
+
                 if not (label or aria_label or aria_labelledby):
                     unlabeled_inputs.append(input_elem)
             
-            print(f"\n📊 Form Accessibility:")
-            print(f"  Total form inputs: {len(inputs)}")
-            print(f"  Unlabeled inputs: {len(unlabeled_inputs)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Form Accessibility:")
+                logger.debug(f"  Total form inputs: {len(inputs)}")
+                logger.debug(f"  Unlabeled inputs: {len(unlabeled_inputs)}")
             
             assert len(unlabeled_inputs) == 0, "All form inputs should have labels"
         else:
-            print("\n📊 Form Accessibility: No form elements found")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Form Accessibility: No form elements found")
     
-    def test_heading_hierarchy(self, client):
+    def test_heading_hierarchy(self, modal_buckets):
         """Test proper heading hierarchy."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
+        modal, _, buckets = modal_buckets
+
         # Get all headings in order
-        headings = modal.select('h1, h2, h3, h4, h5, h6')
+        headings = buckets['heading']
         
         if headings:
-            heading_levels = []
-            for heading in headings:
-                level = int(heading.name[1])  # Extract number from h1, h2, etc.
-                heading_levels.append(level)
-            
-            # Check for proper hierarchy (no skipping levels)
-            hierarchy_issues = []
-            for i in range(1, len(heading_levels)):
-                current_level = heading_levels[i]
-                previous_level = heading_levels[i-1]
-                
-                # Can go down any number of levels, but can only go up one level at a time
-                if current_level > previous_level + 1:
-                    hierarchy_issues.append(f"Skipped from h{previous_level} to h{current_level}")
-            
-            print(f"\n📊 Heading Hierarchy:")
-            print(f"  Headings found: {len(headings)}")
-            print(f"  Heading levels: {heading_levels}")
-            print(f"  Hierarchy issues: {len(hierarchy_issues)}")
-            
-            if hierarchy_issues:
-                print(f"  Issues: {hierarchy_issues}")
-            
-            assert len(hierarchy_issues) == 0, "Heading hierarchy should be proper"
+            heading_levels = [_HLEVEL[heading.name] for heading in headings]
+
+            # Can go down any number of levels, but can only go up one
+            # level at a time. all() over a generator short-circuits on
+            # the first skip and allocates nothing on the passing path;
+            # the diagnostic message only materializes on failure
+            hierarchy_ok = all(
+                current <= previous + 1
+                for previous, current in zip(heading_levels, heading_levels[1:]))
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Heading Hierarchy:")
+                logger.debug(f"  Headings found: {len(headings)}")
+                logger.debug(f"  Heading levels: {heading_levels}")
+
+            assert hierarchy_ok, (
+                f"Heading hierarchy skips levels: {heading_levels}")
         else:
-            print("\n📊 Heading Hierarchy: No headings found in modal")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Heading Hierarchy: No headings found in modal")
     
-    def test_language_attributes(self, client):
+    def test_language_attributes(self, parsed_index):
         """Test language attributes for internationalization."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
+        response, soup = parsed_index
         
         # Check main document language
         html_tag = soup.find('html')
@@ -307,16 +390,14 @@ class TestSystemInfoModalAccessibility:
         modal = soup.find(id='systemInfoModal')
         lang_elements = modal.select('[lang]') if modal else []
         
-        print(f"\n📊 Language Attributes:")
-        print(f"  Document language: {lang_attr}")
-        print(f"  Elements with lang attribute: {len(lang_elements)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Language Attributes:")
+            logger.debug(f"  Document language: {lang_attr}")
+            logger.debug(f"  Elements with lang attribute: {len(lang_elements)}")
     
-    def test_error_message_accessibility(self, client):
+    def test_error_message_accessibility(self, parsed_index):
         """Test error message accessibility."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
+        response, soup = parsed_index
         
         # Look for error message containers
         error_containers = soup.select('.error, .alert, .message, [role="alert"]')
@@ -324,61 +405,44 @@ class TestSystemInfoModalAccessibility:
         # Check ARIA attributes for error messages
         accessible_errors = 0
         for container in error_containers:
-            if (container.get('role') == 'alert' or 
-                container.get('aria-live') or 
-                container.get('aria-atomic')):
+            container_attrs = container.attrs
+            if (container_attrs.get('role') == 'alert' or
+                container_attrs.get('aria-live') or
+                container_attrs.get('aria-atomic')):
                 accessible_errors += 1
         
-        print(f"\n📊 Error Message Accessibility:")
-        print(f"  Error containers found: {len(error_containers)}")
-        print(f"  Accessible error messages: {accessible_errors}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Error Message Accessibility:")
+            logger.debug(f"  Error containers found: {len(error_containers)}")
+            logger.debug(f"  Accessible error messages: {accessible_errors}")
         
         # If error containers exist, they should be accessible
         if error_containers:
             assert accessible_errors > 0, "Error messages should be accessible to screen readers"
     
-    def test_modal_escape_mechanisms(self, client):
+    def test_modal_escape_mechanisms(self, modal_buckets, script_scan):
         """Test multiple ways to close modal (accessibility requirement)."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
+        modal, _, buckets = modal_buckets
+
         # Check for close button
-        close_buttons = modal.select('.close, .terminal-close-btn, [aria-label*="close" i]')
-        
-        # Check for JavaScript that handles Escape key
-        scripts = soup.find_all('script')
-        escape_handler_found = False
-        
-        for script in scripts:
-            if script.string and 'escape' in script.string.lower():
-                escape_handler_found = True
-                break
-        
-        # Check external JS files
-        js_files = soup.find_all('script', src=True)
-        for js_file in js_files:
-            if 'system-info-modal' in js_file.get('src', ''):
-                # Assume external modal JS handles escape
-                escape_handler_found = True
-                break
+        close_buttons = buckets['close']
+
+        # JavaScript that handles the Escape key, assuming the external
+        # modal JS handles it when present (scanned once per session)
+        escape_handler_found = script_scan['escape']
         
-        print(f"\n📊 Modal Escape Mechanisms:")
-        print(f"  Close buttons: {len(close_buttons)}")
-        print(f"  Escape key handler: {escape_handler_found}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Modal Escape Mechanisms:")
+            logger.debug(f"  Close buttons: {len(close_buttons)}")
+            logger.debug(f"  Escape key handler: {escape_handler_found}")
         
         assert len(close_buttons) > 0, "Modal should have close button"
         assert escape_handler_found, "Modal should handle Escape key"
     
-    def test_responsive_accessibility(self, client):
+    def test_responsive_accessibility(self, parsed_index, modal_css):
         """Test accessibility on different screen sizes."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
         # Check for responsive design indicators
-        soup = BeautifulSoup(response.data, 'html.parser')
+        response, soup = parsed_index
         
         # Check viewport meta tag
         viewport = soup.find('meta', attrs={'name': 'viewport'})
@@ -388,16 +452,15 @@ class TestSystemInfoModalAccessibility:
         assert 'width=device-width' in viewport_content, "Viewport should be responsive"
         
         # Check for responsive CSS
-        css_response = client.get('/static/css/system-info-modal.css')
+        css_response, css_content = modal_css
         if css_response.status_code == 200:
-            css_content = css_response.data.decode('utf-8')
-            
             # Look for media queries
-            media_queries = re.findall(r'@media[^{]+{', css_content)
+            media_queries = _MEDIA_RE.findall(css_content)
             
-            print(f"\n📊 Responsive Accessibility:")
-            print(f"  Viewport meta tag: Present")
-            print(f"  Media queries found: {len(media_queries)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Responsive Accessibility:")
+                logger.debug("  Viewport meta tag: Present")
+                logger.debug(f"  Media queries found: {len(media_queries)}")
             
             # Should have responsive design
             assert len(media_queries) > 0, "Should have responsive CSS media queries"
@@ -405,125 +468,129 @@ class TestSystemInfoModalAccessibility:
             pytest.skip("CSS file not accessible for responsive testing")
 
 
+def _check_wcag_perceivable(ctx):
+    """WCAG 1.x Perceivable: text alternatives, structure, contrast."""
+    buckets = ctx['buckets']
+
+    # 1.1 Text Alternatives
+    images = buckets['img']
+    images_with_alt = [alt for alt in buckets['img_alt'] if alt]
+
+    # 1.3 Adaptable - proper heading structure
+    headings = buckets['heading']
+
+    # 1.4 Distinguishable - check for color contrast indicators
+    has_high_contrast = False
+    if ctx['css_response'].status_code == 200:
+        # Terminal themes typically use high contrast
+        has_high_contrast = _HIGH_CONTRAST_RE.search(ctx['css_text']) is not None
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📊 WCAG Perceivable Compliance:")
+        logger.debug(f"  Images with alt text: {len(images_with_alt)}/{len(images)}")
+        logger.debug(f"  Proper headings: {len(headings)}")
+        logger.debug(f"  High contrast design: {has_high_contrast}")
+
+    if images:
+        assert len(images_with_alt) == len(images), "All images should have alt text"
+    assert has_high_contrast, "Should use high contrast colors"
+
+
+def _check_wcag_operable(ctx):
+    """WCAG 2.x Operable: keyboard access and navigability."""
+    tree, modal = ctx['lxml_tree'], ctx['lxml_modal']
+    assert modal is not None
+
+    # 2.1 Keyboard Accessible
+    focusable_elements = modal.xpath(_FOCUSABLE_XPATH)
+
+    # 2.4 Navigable - check for skip links and proper headings
+    skip_links = tree.xpath(_SKIP_LINK_XPATH)
+    headings = modal.xpath(_HEADING_XPATH)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📊 WCAG Operable Compliance:")
+        logger.debug(f"  Focusable elements: {len(focusable_elements)}")
+        logger.debug(f"  Skip links: {len(skip_links)}")
+        logger.debug(f"  Navigation headings: {len(headings)}")
+
+    assert len(focusable_elements) > 0, "Should have keyboard accessible elements"
+
+
+def _check_wcag_understandable(ctx):
+    """WCAG 3.x Understandable: language, predictability, input help."""
+    buckets = ctx['buckets']
+
+    # 3.1 Readable - language identification
+    html_tag = ctx['soup'].find('html')
+    has_lang = html_tag and html_tag.get('lang')
+
+    # 3.2 Predictable - consistent navigation
+    close_buttons = buckets['close']
+
+    # 3.3 Input Assistance - error identification
+    form_elements = buckets['form_field']
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📊 WCAG Understandable Compliance:")
+        logger.debug(f"  Language specified: {bool(has_lang)}")
+        logger.debug(f"  Consistent close mechanisms: {len(close_buttons)}")
+        logger.debug(f"  Form elements: {len(form_elements)}")
+
+    assert has_lang, "Document should specify language"
+    assert len(close_buttons) > 0, "Should have consistent close mechanism"
+
+
+def _check_wcag_robust(ctx):
+    """WCAG 4.x Robust: compatible markup and ARIA usage."""
+    # 4.1 Compatible - proper markup and ARIA
+    aria_elements = ctx['buckets']['aria']
+
+    # Check for valid HTML structure
+    modal_attrs = ctx['modal_attrs']
+    required_modal_attrs = ['id', 'role']
+    has_required_attrs = all(modal_attrs.get(attr) for attr in required_modal_attrs)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📊 WCAG Robust Compliance:")
+        logger.debug(f"  ARIA attributes: {len(aria_elements)}")
+        logger.debug(f"  Required modal attributes: {has_required_attrs}")
+
+    assert len(aria_elements) > 0, "Should use ARIA attributes"
+    assert has_required_attrs, "Modal should have required attributes"
+
+
+@pytest.fixture(scope='session')
+def wcag_context(parsed_index, modal_buckets, lxml_modal, modal_css):
+    """Bundle the shared session artifacts for the guideline checkers."""
+    _, soup = parsed_index
+    modal, modal_attrs, buckets = modal_buckets
+    tree, xmodal = lxml_modal
+    css_response, css_text = modal_css
+    return {
+        'soup': soup,
+        'modal': modal,
+        'modal_attrs': modal_attrs,
+        'buckets': buckets,
+        'lxml_tree': tree,
+        'lxml_modal': xmodal,
+        'css_response': css_response,
+        'css_text': css_text,
+    }
+
+
 class TestSystemInfoModalWCAGCompliance:
     """Test suite for WCAG 2.1 AA compliance."""
-    
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        with app.test_client() as client:
-            with app.app_context():
-                initialize_database(':memory:')
-                yield client
-    
-    def test_wcag_perceivable_compliance(self, client):
-        """Test WCAG Perceivable guideline compliance."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
-        # 1.1 Text Alternatives
-        images = modal.select('img')
-        images_with_alt = [img for img in images if img.get('alt')]
-        
-        # 1.3 Adaptable - proper heading structure
-        headings = modal.select('h1, h2, h3, h4, h5, h6')
-        
-        # 1.4 Distinguishable - check for color contrast indicators
-        css_response = client.get('/static/css/system-info-modal.css')
-        has_high_contrast = False
-        if css_response.status_code == 200:
-            css_content = css_response.data.decode('utf-8').lower()
-            # Terminal themes typically use high contrast
-            high_contrast_indicators = ['#00ff', '#ffffff', '#000000', 'contrast']
-            has_high_contrast = any(indicator in css_content for indicator in high_contrast_indicators)
-        
-        print(f"\n📊 WCAG Perceivable Compliance:")
-        print(f"  Images with alt text: {len(images_with_alt)}/{len(images)}")
-        print(f"  Proper headings: {len(headings)}")
-        print(f"  High contrast design: {has_high_contrast}")
-        
-        # Assertions
-        if images:
-            assert len(images_with_alt) == len(images), "All images should have alt text"
-        assert has_high_contrast, "Should use high contrast colors"
-    
-    def test_wcag_operable_compliance(self, client):
-        """Test WCAG Operable guideline compliance."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
-        # 2.1 Keyboard Accessible
-        focusable_elements = modal.select('button, input, select, textarea, a[href], [tabindex]:not([tabindex="-1"])')
-        
-        # 2.4 Navigable - check for skip links and proper headings
-        skip_links = soup.select('a[href^="#"]')
-        headings = modal.select('h1, h2, h3, h4, h5, h6')
-        
-        print(f"\n📊 WCAG Operable Compliance:")
-        print(f"  Focusable elements: {len(focusable_elements)}")
-        print(f"  Skip links: {len(skip_links)}")
-        print(f"  Navigation headings: {len(headings)}")
-        
-        # Should have keyboard accessible elements
-        assert len(focusable_elements) > 0, "Should have keyboard accessible elements"
-    
-    def test_wcag_understandable_compliance(self, client):
-        """Test WCAG Understandable guideline compliance."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        
-        # 3.1 Readable - language identification
-        html_tag = soup.find('html')
-        has_lang = html_tag and html_tag.get('lang')
-        
-        # 3.2 Predictable - consistent navigation
-        modal = soup.find(id='systemInfoModal')
-        close_buttons = modal.select('.close, .terminal-close-btn, [aria-label*="close" i]')
-        
-        # 3.3 Input Assistance - error identification
-        form_elements = modal.select('input, select, textarea')
-        
-        print(f"\n📊 WCAG Understandable Compliance:")
-        print(f"  Language specified: {bool(has_lang)}")
-        print(f"  Consistent close mechanisms: {len(close_buttons)}")
-        print(f"  Form elements: {len(form_elements)}")
-        
-        assert has_lang, "Document should specify language"
-        assert len(close_buttons) > 0, "Should have consistent close mechanism"
-    
-    def test_wcag_robust_compliance(self, client):
-        """Test WCAG Robust guideline compliance."""
-        response = client.get('/')
-        assert response.status_code == 200
-        
-        soup = BeautifulSoup(response.data, 'html.parser')
-        modal = soup.find(id='systemInfoModal')
-        
-        # 4.1 Compatible - proper markup and ARIA
-        # Check for proper ARIA attributes
-        aria_elements = modal.select('[aria-hidden], [aria-label], [aria-labelledby], [role]')
-        
-        # Check for valid HTML structure
-        required_modal_attrs = ['id', 'role']
-        has_required_attrs = all(modal.get(attr) for attr in required_modal_attrs)
-        
-        print(f"\n📊 WCAG Robust Compliance:")
-        print(f"  ARIA attributes: {len(aria_elements)}")
-        print(f"  Required modal attributes: {has_required_attrs}")
-        
-        assert len(aria_elements) > 0, "Should use ARIA attributes"
-        assert has_required_attrs, "Modal should have required attributes"
+
+    @pytest.mark.parametrize(
+        'checker',
+        [_check_wcag_perceivable, _check_wcag_operable,
+         _check_wcag_understandable, _check_wcag_robust],
+        ids=['1.x-perceivable', '2.x-operable',
+             '3.x-understandable', '4.x-robust'])
+    def test_wcag_compliance(self, wcag_context, checker):
+        """Run each WCAG 2.1 AA guideline check against the shared DOM."""
+        checker(wcag_context)
 
 
 if __name__ == '__main__':
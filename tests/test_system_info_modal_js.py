@@ -4,6 +4,7 @@ JavaScript Testing Suite for System Info Modal
 Tests JavaScript functionality using Selenium WebDriver
 """
 
+import logging
 import pytest
 import time
 import json
@@ -14,89 +15,140 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from app import create_app
-import threading
-import socket
+
+# Selenium logs every wire command at DEBUG/INFO; with short-poll
+# explicit waits that is thousands of lines per run, all formatted even
+# when no handler shows them
+logging.getLogger("selenium").setLevel(logging.WARNING)
+
+
+# Chrome flags that cut headless startup and per-page cost: background
+# services, first-run work and image decoding are all dead weight for
+# these DOM-level tests. The eager page-load strategy returns from
+# driver.get on DOMContentLoaded instead of the full load event.
+_CHROME_FLAGS = (
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1920,1080",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--safebrowsing-disable-auto-update",
+    "--disable-features=TranslateUI,BlinkGenPropertyTrees",
+    "--blink-settings=imagesEnabled=false",
+)
+
+
+def _fast_chrome_options():
+    """Build Chrome options tuned for fast headless test startup."""
+    chrome_options = Options()
+    for flag in _CHROME_FLAGS:
+        chrome_options.add_argument(flag)
+    chrome_options.page_load_strategy = "eager"
+    # Stop Chrome's own logging subprocess chatter on stderr
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    return chrome_options
+
+
+# CSS-selector locators shared by both suites. The CSS engine is the
+# fastest locator dispatch path in the driver, and one constant per
+# element keeps the selectors in sync across tests.
+MODAL = (By.CSS_SELECTOR, "#systemInfoModal")
+CLOSE_BTN = (By.CSS_SELECTOR, ".terminal-close-btn")
+TERMINAL_CONTENT = (By.CSS_SELECTOR, ".terminal-content")
+
+
+def _ensure_on_app(driver, app_server):
+    """Navigate to the app only if the browser is not already there.
+
+    The current_url check costs one cheap RPC; a redundant driver.get
+    costs a full page load.
+    """
+    if driver.current_url != app_server + "/":
+        driver.get(app_server)
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located(MODAL)
+        )
 
 
 class TestSystemInfoModalJavaScript:
     """Test suite for System Info Modal JavaScript functionality."""
     
     @pytest.fixture(scope="class")
-    def app_server(self):
-        """Start Flask app server for testing."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        # Find available port
-        sock = socket.socket()
-        sock.bind(('', 0))
-        port = sock.getsockname()[1]
-        sock.close()
-        
-        # Start server in thread
-        server_thread = threading.Thread(
-            target=lambda: app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
-        )
-        server_thread.daemon = True
-        server_thread.start()
-        
-        # Wait for server to start
-        time.sleep(2)
-        
-        yield f"http://127.0.0.1:{port}"
-    
-    @pytest.fixture
-    def driver(self):
-        """Create Chrome WebDriver for testing."""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run in headless mode
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
+    def driver(self, chrome_service):
+        """Create one Chrome WebDriver shared by the whole class.
+
+        Launching headless Chrome costs seconds; reusing the browser and
+        resetting state between tests keeps that cost to one startup per
+        class.
+        """
+        chrome_options = _fast_chrome_options()
         
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.implicitly_wait(10)
+            driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
+            # No implicit wait: it compounds with every find_element and
+            # stretches negative-path lookups to the full timeout. The
+            # tests rely on targeted WebDriverWait calls instead.
             yield driver
         except Exception as e:
             pytest.skip(f"Chrome WebDriver not available: {e}")
         finally:
             if 'driver' in locals():
                 driver.quit()
-    
-    def test_modal_initialization(self, driver, app_server):
+
+    @pytest.fixture(scope="class", autouse=True)
+    def _load_page(self, driver, app_server):
+        """Navigate to the app once per class.
+
+        With the class-scoped driver and eager load strategy the page is
+        fetched a single time; tests reset modal state via JS instead of
+        re-navigating. Tests that need a pristine page (the memory-leak
+        baseline) call driver.get themselves.
+        """
+        _ensure_on_app(driver, app_server)
+
+    @pytest.fixture(autouse=True)
+    def _reset_browser_state(self, driver):
+        """Return the shared browser to a known state after each test."""
+        yield
+        driver.execute_script(
+            "window.hideSystemInfoModal && window.hideSystemInfoModal();")
+        driver.delete_all_cookies()
+
+    def test_modal_initialization(self, driver):
         """Test that modal JavaScript initializes correctly."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        
-        # Check that SystemInfoModal object exists
-        modal_exists = driver.execute_script("return typeof SystemInfoModal !== 'undefined';")
-        assert modal_exists, "SystemInfoModal object not found"
-        
-        # Check that global functions exist
-        show_function_exists = driver.execute_script("return typeof window.showSystemInfoModal === 'function';")
-        assert show_function_exists, "showSystemInfoModal function not found"
-        
-        hide_function_exists = driver.execute_script("return typeof window.hideSystemInfoModal === 'function';")
-        assert hide_function_exists, "hideSystemInfoModal function not found"
+        # One round trip to chromedriver for all three probes instead of
+        # a script call per boolean
+        info = driver.execute_script("""
+            return {
+                modal: typeof SystemInfoModal !== 'undefined',
+                show: typeof window.showSystemInfoModal === 'function',
+                hide: typeof window.hideSystemInfoModal === 'function'
+            };
+        """)
+
+        assert info['modal'], "SystemInfoModal object not found"
+        assert info['show'], "showSystemInfoModal function not found"
+        assert info['hide'], "hideSystemInfoModal function not found"
     
-    def test_modal_show_hide_functionality(self, driver, app_server):
-        """Test modal show and hide functionality."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
+    @pytest.mark.parametrize("close_trigger", ["js", "escape", "button"])
+    def test_modal_closes(self, driver, close_trigger):
+        """Test that the modal opens and closes via each mechanism.
+
+        One parametrized body covers the JS call, the Escape key and the
+        close button; only the trigger differs between runs.
+        """
+        # Locate the modal once; every later check reuses the element
+        modal = driver.find_element(*MODAL)
         
         # Check initial state (modal should be hidden)
-        modal = driver.find_element(By.ID, "systemInfoModal")
         initial_display = modal.value_of_css_property("display")
         assert initial_display == "none", "Modal should be initially hidden"
         
@@ -104,101 +156,36 @@ class TestSystemInfoModalJavaScript:
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
-        # Check that modal is now visible
-        modal_display = modal.value_of_css_property("display")
-        assert modal_display != "none", "Modal should be visible after show()"
-        
-        # Hide modal
-        driver.execute_script("window.hideSystemInfoModal();")
-        
-        # Wait for modal to be hidden
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") == "none"
-        )
-        
-        # Check that modal is hidden again
-        final_display = modal.value_of_css_property("display")
-        assert final_display == "none", "Modal should be hidden after hide()"
-    
-    def test_modal_keyboard_navigation(self, driver, app_server):
-        """Test keyboard navigation and accessibility."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
-        
-        # Show modal
-        driver.execute_script("window.showSystemInfoModal();")
-        
-        # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
-        )
-        
-        # Test Escape key closes modal
-        driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        # Trigger the close mechanism under test
+        if close_trigger == "js":
+            driver.execute_script("window.hideSystemInfoModal();")
+        elif close_trigger == "escape":
+            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+        else:
+            # A short explicit wait keeps the missing-button path at 2 s
+            try:
+                close_button = WebDriverWait(driver, 2).until(
+                    EC.element_to_be_clickable(CLOSE_BTN)
+                )
+            except (TimeoutException, NoSuchElementException):
+                pytest.skip("Close button not found in modal")
+            close_button.click()
         
         # Wait for modal to be hidden
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") == "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.invisibility_of_element(modal)
         )
         
-        # Check that modal is hidden
-        modal = driver.find_element(By.ID, "systemInfoModal")
         final_display = modal.value_of_css_property("display")
-        assert final_display == "none", "Modal should close with Escape key"
+        assert final_display == "none", f"Modal should close via {close_trigger}"
     
-    def test_modal_close_button(self, driver, app_server):
-        """Test modal close button functionality."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
-        
-        # Show modal
-        driver.execute_script("window.showSystemInfoModal();")
-        
-        # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
-        )
-        
-        # Find and click close button
-        try:
-            close_button = driver.find_element(By.CLASS_NAME, "terminal-close-btn")
-            close_button.click()
-            
-            # Wait for modal to be hidden
-            WebDriverWait(driver, 5).until(
-                lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") == "none"
-            )
-            
-            # Check that modal is hidden
-            modal = driver.find_element(By.ID, "systemInfoModal")
-            final_display = modal.value_of_css_property("display")
-            assert final_display == "none", "Modal should close when close button is clicked"
-            
-        except NoSuchElementException:
-            pytest.skip("Close button not found in modal")
-    
-    def test_modal_accessibility_attributes(self, driver, app_server):
+    def test_modal_accessibility_attributes(self, driver):
         """Test that modal has proper accessibility attributes."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
-        
-        modal = driver.find_element(By.ID, "systemInfoModal")
+        modal = driver.find_element(*MODAL)
         
         # Check initial ARIA attributes
         initial_aria_hidden = modal.get_attribute("aria-hidden")
@@ -208,28 +195,28 @@ class TestSystemInfoModalJavaScript:
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
-        # Check ARIA attributes when visible
-        visible_aria_hidden = modal.get_attribute("aria-hidden")
-        assert visible_aria_hidden == "false", "Modal should have aria-hidden='false' when visible"
-        
-        role = modal.get_attribute("role")
-        assert role == "dialog", "Modal should have role='dialog'"
-        
-        aria_modal = modal.get_attribute("aria-modal")
-        assert aria_modal == "true", "Modal should have aria-modal='true'"
+        # Check ARIA attributes when visible; collect them in one script
+        # call instead of a get_attribute round trip per attribute
+        aria = driver.execute_script("""
+            var m = arguments[0];
+            return {
+                hidden: m.getAttribute('aria-hidden'),
+                role: m.getAttribute('role'),
+                modal: m.getAttribute('aria-modal')
+            };
+        """, modal)
+
+        assert aria['hidden'] == "false", "Modal should have aria-hidden='false' when visible"
+        assert aria['role'] == "dialog", "Modal should have role='dialog'"
+        assert aria['modal'] == "true", "Modal should have aria-modal='true'"
     
-    def test_modal_focus_management(self, driver, app_server):
+    def test_modal_focus_management(self, driver):
         """Test focus management in modal."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
+        modal = driver.find_element(*MODAL)
         
         # Store initial focused element
         initial_focus = driver.execute_script("return document.activeElement.tagName;")
@@ -238,71 +225,62 @@ class TestSystemInfoModalJavaScript:
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
-        # Check that focus moved to modal or focusable element within modal
-        time.sleep(0.5)  # Allow time for focus to move
-        current_focus = driver.execute_script("return document.activeElement;")
-        
-        # Focus should be within modal or on modal itself
-        modal = driver.find_element(By.ID, "systemInfoModal")
-        is_focus_in_modal = driver.execute_script("""
-            var modal = arguments[0];
-            var activeElement = document.activeElement;
-            return modal === activeElement || modal.contains(activeElement);
-        """, modal)
+        # Poll until focus moves into the modal instead of sleeping a
+        # fixed half second; the wait returns as soon as focus settles
+        try:
+            is_focus_in_modal = WebDriverWait(driver, 2).until(
+                lambda d: d.execute_script("""
+                    var modal = arguments[0];
+                    var activeElement = document.activeElement;
+                    return modal === activeElement || modal.contains(activeElement);
+                """, modal)
+            )
+        except TimeoutException:
+            is_focus_in_modal = False
         
         assert is_focus_in_modal, "Focus should be within modal when opened"
     
-    def test_modal_data_loading(self, driver, app_server):
+    def test_modal_data_loading(self, driver):
         """Test that modal loads data correctly."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
+        modal = driver.find_element(*MODAL)
         
         # Show modal
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
         # Wait for data to load (look for specific content)
         try:
             WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "terminal-content"))
+                EC.presence_of_element_located(TERMINAL_CONTENT)
             )
             
             # Check that some system info content is present
-            modal_content = driver.find_element(By.ID, "systemInfoModal").text
+            modal_content = modal.text
             
             # Should contain some system information
             assert len(modal_content) > 0, "Modal should contain system information"
             
-            # Look for common system info terms
+            # Look for common system info terms; lowercase the content
+            # once instead of per term
             system_terms = ["system", "status", "codexam", "platform", "info"]
-            has_system_content = any(term.lower() in modal_content.lower() for term in system_terms)
+            content = modal_content.lower()
+            has_system_content = any(term in content for term in system_terms)
             assert has_system_content, "Modal should contain system-related content"
             
         except TimeoutException:
             pytest.skip("Modal content not loaded within timeout")
     
-    def test_modal_animations(self, driver, app_server):
+    def test_modal_animations(self, driver):
         """Test modal animations and transitions."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
-        
-        modal = driver.find_element(By.ID, "systemInfoModal")
+        modal = driver.find_element(*MODAL)
         
         # Check initial opacity
         initial_opacity = modal.value_of_css_property("opacity")
@@ -311,61 +289,61 @@ class TestSystemInfoModalJavaScript:
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
-        # Check that opacity changed (indicating animation)
-        time.sleep(0.5)  # Allow time for animation
+        # Wait for the fade-in to finish rather than sleeping through it
+        try:
+            WebDriverWait(driver, 2).until(
+                lambda d: float(modal.value_of_css_property("opacity")) > 0.5
+            )
+        except TimeoutException:
+            pass  # Fall through to the assertion for a clear failure
         visible_opacity = modal.value_of_css_property("opacity")
         
         # Opacity should be 1 or close to 1 when visible
         assert float(visible_opacity) > 0.5, "Modal should have high opacity when visible"
     
-    def test_modal_responsive_behavior(self, driver, app_server):
+    def test_modal_responsive_behavior(self, driver):
         """Test modal responsive behavior on different screen sizes."""
-        driver.get(app_server)
-        
         # Test desktop size
         driver.set_window_size(1920, 1080)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
+        modal = driver.find_element(*MODAL)
         
         # Show modal
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
-        modal = driver.find_element(By.ID, "systemInfoModal")
         desktop_width = modal.size['width']
         
         # Test mobile size
         driver.set_window_size(375, 667)  # iPhone size
-        time.sleep(1)  # Allow time for responsive changes
+        # Poll for the relayout instead of a fixed one-second sleep; the
+        # width may legitimately stay the same, so a timeout just falls
+        # through to the assertion
+        try:
+            WebDriverWait(driver, 2).until(
+                lambda d: modal.size['width'] != desktop_width
+            )
+        except TimeoutException:
+            pass
         
         mobile_width = modal.size['width']
         
         # Modal should adapt to screen size
         assert mobile_width <= desktop_width, "Modal should adapt to smaller screen sizes"
         
-        # Hide modal
+        # Hide modal and restore the shared browser's window size
         driver.execute_script("window.hideSystemInfoModal();")
+        driver.set_window_size(1920, 1080)
     
-    def test_modal_error_handling(self, driver, app_server):
+    def test_modal_error_handling(self, driver):
         """Test modal error handling."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        
         # Test calling show multiple times
         result1 = driver.execute_script("return window.showSystemInfoModal();")
         result2 = driver.execute_script("return window.showSystemInfoModal();")
@@ -382,93 +360,95 @@ class TestSystemInfoModalJavaScript:
     
     def test_modal_memory_leaks(self, driver, app_server):
         """Test for potential memory leaks in modal."""
+        # Fresh page load so the global-object baseline is not skewed by
+        # earlier tests in the shared browser
         driver.get(app_server)
         
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
+        # Wait for page to load; the wait returns the element, which the
+        # show/hide loop below reuses instead of re-finding per poll
+        modal = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located(MODAL)
         )
         
-        # Get initial memory usage (approximate)
-        initial_objects = driver.execute_script("return Object.keys(window).length;")
+        # Force a GC, then read the real JS heap via performance.memory
+        # instead of enumerating every window property
+        driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        initial_heap = driver.execute_script(
+            "return performance.memory ? performance.memory.usedJSHeapSize : 0;")
         
-        # Show and hide modal multiple times
+        # Show and hide modal multiple times, waiting on the display
+        # state instead of fixed 200 ms sleeps per transition
         for _ in range(5):
             driver.execute_script("window.showSystemInfoModal();")
-            time.sleep(0.2)
+            WebDriverWait(driver, 2, poll_frequency=0.1).until(
+                EC.visibility_of(modal)
+            )
             driver.execute_script("window.hideSystemInfoModal();")
-            time.sleep(0.2)
+            WebDriverWait(driver, 2, poll_frequency=0.1).until(
+                EC.invisibility_of_element(modal)
+            )
         
-        # Check final memory usage
-        final_objects = driver.execute_script("return Object.keys(window).length;")
+        # Collect again so transient allocations don't count as leaks
+        driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        final_heap = driver.execute_script(
+            "return performance.memory ? performance.memory.usedJSHeapSize : 0;")
         
-        # Object count shouldn't grow significantly
-        object_growth = final_objects - initial_objects
-        assert object_growth < 10, "Modal shouldn't create excessive global objects"
+        # Heap shouldn't grow significantly across five show/hide cycles
+        heap_growth = final_heap - initial_heap
+        assert heap_growth < 1024 * 1024, "Modal shouldn't leak heap across show/hide cycles"
 
 
 class TestSystemInfoModalCommands:
     """Test suite for modal command system."""
     
     @pytest.fixture(scope="class")
-    def app_server(self):
-        """Start Flask app server for testing."""
-        app = create_app()
-        app.config['TESTING'] = True
-        
-        # Find available port
-        sock = socket.socket()
-        sock.bind(('', 0))
-        port = sock.getsockname()[1]
-        sock.close()
-        
-        # Start server in thread
-        server_thread = threading.Thread(
-            target=lambda: app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
-        )
-        server_thread.daemon = True
-        server_thread.start()
-        
-        # Wait for server to start
-        time.sleep(2)
-        
-        yield f"http://127.0.0.1:{port}"
-    
-    @pytest.fixture
-    def driver(self):
-        """Create Chrome WebDriver for testing."""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
+    def driver(self, chrome_service):
+        """Create one Chrome WebDriver shared by the whole class.
+
+        Same reuse pattern as TestSystemInfoModalJavaScript: one browser
+        startup per class, with per-test state resets.
+        """
+        chrome_options = _fast_chrome_options()
         
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.implicitly_wait(10)
+            driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
+            # No implicit wait: it compounds with every find_element and
+            # stretches negative-path lookups to the full timeout. The
+            # tests rely on targeted WebDriverWait calls instead.
             yield driver
         except Exception as e:
             pytest.skip(f"Chrome WebDriver not available: {e}")
         finally:
             if 'driver' in locals():
                 driver.quit()
-    
-    def test_command_system_exists(self, driver, app_server):
+
+    @pytest.fixture(autouse=True)
+    def _reset_browser_state(self, driver):
+        """Return the shared browser to a known state after each test."""
+        yield
+        driver.execute_script(
+            "window.hideSystemInfoModal && window.hideSystemInfoModal();")
+        driver.delete_all_cookies()
+
+    @pytest.fixture(autouse=True)
+    def _goto(self, driver, app_server):
+        """Make sure each test starts on the app page.
+
+        Only the first test in the class actually navigates; the guard
+        in _ensure_on_app makes later runs a no-op.
+        """
+        _ensure_on_app(driver, app_server)
+
+    def test_command_system_exists(self, driver):
         """Test that command system is available."""
-        driver.get(app_server)
-        
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
+        modal = driver.find_element(*MODAL)
         
         # Show modal
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
         # Look for command input or terminal interface
@@ -480,7 +460,7 @@ class TestSystemInfoModalCommands:
                 assert len(command_elements) > 0, "Command input should be available"
             else:
                 # If no input found, check for command-related content
-                modal_content = driver.find_element(By.ID, "systemInfoModal").text
+                modal_content = modal.text
                 command_terms = ["command", "help", "terminal", "prompt", "$", ">"]
                 has_command_content = any(term in modal_content.lower() for term in command_terms)
                 assert has_command_content, "Modal should have command-related content"
@@ -488,20 +468,15 @@ class TestSystemInfoModalCommands:
         except NoSuchElementException:
             pytest.skip("Command system elements not found")
     
-    def test_help_command(self, driver, app_server):
+    def test_help_command(self, driver):
         """Test help command functionality."""
-        driver.get(app_server)
-        
-        # Wait for page to load and show modal
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "systemInfoModal"))
-        )
+        modal = driver.find_element(*MODAL)
         
         driver.execute_script("window.showSystemInfoModal();")
         
         # Wait for modal to be visible
-        WebDriverWait(driver, 5).until(
-            lambda d: d.find_element(By.ID, "systemInfoModal").value_of_css_property("display") != "none"
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            EC.visibility_of(modal)
         )
         
         # Try to execute help command via JavaScript